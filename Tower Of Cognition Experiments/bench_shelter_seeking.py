@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the shelter-seeking world (psudocode_shelter_seeking.py).
+
+Scaling runs measure steps/second and peak traced memory as a function
+of world size, live food count, number of agents, number of shelters
+and run length. Micro-benchmarks isolate get_nearby_food, sense and
+World.update.
+
+Everything is headless and seeded, so two result files taken on the
+same machine are directly comparable:
+
+    python bench_shelter_seeking.py --out before.json
+    python bench_shelter_seeking.py --out after.json
+    python bench_shelter_seeking.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from psudocode_shelter_seeking import ShelterSeekingTardigrade, World
+
+
+SEED = 1234
+
+# Scaling axes: each sweeps one parameter around the defaults.
+DEFAULTS = {'size': 100.0, 'food': 10, 'agents': 1, 'shelters': 1, 'steps': 20_000}
+AXES = {
+    'size': [100.0, 1_000.0, 10_000.0],
+    'food': [10, 100, 1_000],
+    'agents': [1, 4, 16],
+    'shelters': [1, 64, 1_024],
+    'steps': [5_000, 20_000, 80_000],
+}
+QUICK_DEFAULTS = dict(DEFAULTS, steps=2_000)
+QUICK_AXES = {
+    'size': [100.0, 1_000.0],
+    'food': [10, 100],
+    'agents': [1, 4],
+    'shelters': [1, 64],
+    'steps': [2_000, 8_000],
+}
+
+
+def build(size: float, food: int, agents: int, shelters: int = 1):
+    """Seeded world with `food` live items, `agents` agents and `shelters` shelters."""
+    random.seed(SEED)
+    world = World(width=size, height=size, n_shelters=shelters)
+    for _ in range(food):
+        world.spawn_food()
+    pop = [
+        ShelterSeekingTardigrade(x=random.uniform(10, size - 10), y=random.uniform(10, size - 10))
+        for _ in range(agents)
+    ]
+    return world, pop
+
+
+def simulate(world: World, agents: List[ShelterSeekingTardigrade], steps: int):
+    # Food is never consumed by the redacted _execute, so the live count
+    # stays at what build() spawned and no respawn is needed.
+    for _ in range(steps):
+        events = world.update()
+        for agent in agents:
+            if events.storm_started:
+                agent.observe_storm_start(world)
+            if events.storm_ended:
+                agent.observe_storm_end()
+            agent.step(world)
+
+
+def bench_scaling(params: Dict, measure_memory: bool) -> Dict:
+    world, agents = build(params['size'], params['food'], params['agents'], params['shelters'])
+    t0 = time.perf_counter()
+    simulate(world, agents, params['steps'])
+    elapsed = time.perf_counter() - t0
+
+    result = {
+        'steps_per_sec': params['steps'] / elapsed,
+        'agent_steps_per_sec': params['steps'] * params['agents'] / elapsed,
+        'seconds': elapsed,
+    }
+
+    if measure_memory:
+        # Separate pass: tracing slows the loop too much to time it.
+        tracemalloc.start()
+        world, agents = build(params['size'], params['food'], params['agents'], params['shelters'])
+        simulate(world, agents, params['steps'])
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return result
+
+
+def _ns_per_call(fn, calls: int, repeats: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / calls)
+    return best
+
+
+def _uncached_sense(world: World, agent: ShelterSeekingTardigrade):
+    """agent.sense with the per-tick shelter query cache dropped first,
+    as it is on every real step."""
+    def sense():
+        world._shelter_query.tick = -1
+        return agent.sense(world)
+    return sense
+
+
+def bench_micro(quick: bool) -> List[Dict]:
+    calls = 2_000 if quick else 20_000
+    results = []
+    for food in ([10, 100] if quick else [10, 100, 1_000]):
+        world, (agent,) = build(100.0, food, 1)
+        x, y, sensing = agent.x, agent.y, agent.sensing
+        cases = {
+            'get_nearby_food': lambda: world.get_nearby_food(x, y, 30.0),
+            'nearby_food_into': lambda: world.nearby_food_into(x, y, 30.0, sensing),
+            'sense': _uncached_sense(world, agent),
+        }
+        for name, fn in cases.items():
+            results.append({
+                'suite': 'micro',
+                'case': name,
+                'params': {'food': food},
+                'ns_per_call': _ns_per_call(fn, calls),
+            })
+
+    for shelters in ([1, 64] if quick else [1, 64, 1_024]):
+        world, (agent,) = build(1_000.0, 10, 1, shelters)
+        results.append({
+            'suite': 'micro',
+            'case': 'sense',
+            'params': {'food': 10, 'shelters': shelters},
+            'ns_per_call': _ns_per_call(_uncached_sense(world, agent), calls),
+        })
+
+    world, _ = build(100.0, 0, 0)
+    results.append({
+        'suite': 'micro',
+        'case': 'World.update',
+        'params': {},
+        'ns_per_call': _ns_per_call(world.update, calls * 10),
+    })
+    return results
+
+
+def run_all(quick: bool, measure_memory: bool) -> Dict:
+    results = []
+    defaults = QUICK_DEFAULTS if quick else DEFAULTS
+    for axis, values in (QUICK_AXES if quick else AXES).items():
+        for value in values:
+            params = dict(defaults, **{axis: value})
+            print(f"  scaling {axis}={value} ...", flush=True)
+            results.append({
+                'suite': 'scaling',
+                'case': axis,
+                'params': params,
+                **bench_scaling(params, measure_memory),
+            })
+
+    print("  micro-benchmarks ...", flush=True)
+    results.extend(bench_micro(quick))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'seed': SEED,
+            'quick': quick,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def _key(r: Dict) -> str:
+    return f"{r['suite']}/{r['case']}/{json.dumps(r['params'], sort_keys=True)}"
+
+
+def compare(before_path: str, after_path: str):
+    """Print the ratio of after/before for every case both files share."""
+    with open(before_path) as fh:
+        before = {_key(r): r for r in json.load(fh)['results']}
+    with open(after_path) as fh:
+        after = {_key(r): r for r in json.load(fh)['results']}
+
+    print(f"{'case':<64}{'before':>14}{'after':>14}{'speedup':>9}")
+    for key, a in after.items():
+        b = before.get(key)
+        if b is None:
+            continue
+        if 'steps_per_sec' in a:
+            old, new = b['steps_per_sec'], a['steps_per_sec']
+            speedup = new / old
+        else:
+            old, new = b['ns_per_call'], a['ns_per_call']
+            speedup = old / new
+        print(f"{key:<64}{old:>14.1f}{new:>14.1f}{speedup:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--out', default='bench_results.json', help='where to write results (JSON)')
+    parser.add_argument('--quick', action='store_true', help='small sizes for a smoke run')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc passes')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    print("Running shelter-seeking benchmarks...")
+    report = run_all(args.quick, not args.no_memory)
+    with open(args.out, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
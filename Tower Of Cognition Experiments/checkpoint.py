@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Binary checkpoints for the shelter-seeking experiment.
+
+save_checkpoint writes the world, the agent and the `random` module's
+state; load_checkpoint rebuilds them, so a run split at any step and
+resumed continues bit-identically:
+
+    save_checkpoint('run.ck', world, agent, next_step)
+    world, agent, next_step = load_checkpoint('run.ck')
+
+Little-endian layout, written section by section: header, RNG state,
+world scalars, food pool, shelters, agent, shelter memories, dicts,
+and the agent's ConvergenceMonitor history if one is attached.
+Bin contents (the bins' ring slots) and carried food are stored as
+indices into the food pool so that object identity survives a round
+trip. Floats are stored as doubles.
+
+    python checkpoint.py      # check that a split run resumes bit-identically
+"""
+
+import os
+import random
+import struct
+import tempfile
+from typing import Dict, List, Tuple
+
+from convergence import ConvergenceMonitor
+from psudocode_shelter_seeking import (
+    Food,
+    ShelterBin,
+    ShelterSeekingTardigrade,
+    World,
+    simulation_step,
+)
+
+
+CHECKPOINT_MAGIC = b'VSCK'
+CHECKPOINT_VERSION = 1
+
+_HEADER = struct.Struct('<4sHq')              # magic, version, next step
+_RNG_HEAD = struct.Struct('<qI')              # state version, state length
+_RNG_GAUSS = struct.Struct('<?d')             # has gauss_next, gauss_next
+_WORLD = struct.Struct('<ddqq?qqqq?qqqqd')
+_FOOD = struct.Struct('<qddd???q')
+_BIN = struct.Struct('<dddqq')
+_MEMORY = struct.Struct('<ddd')
+_AGENT = struct.Struct('<dddddq?ddd?qd??dd6q')
+_MONITOR = struct.Struct('<qdqdq?q?')        # window, tol, diverge window/above, cycles,
+                                              # converged?, converged step, diverged
+_FLAG = struct.Struct('<?')
+_COUNT = struct.Struct('<I')
+_INDEX = struct.Struct('<I')
+_NAME = struct.Struct('<H')
+_VALUE = struct.Struct('<d')
+
+
+class _Reader:
+    """Sequential struct reader over a checkpoint buffer."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def read(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def read_indices(self, n: int) -> Tuple[int, ...]:
+        values = struct.unpack_from(f'<{n}I', self.data, self.offset)
+        self.offset += 4 * n
+        return values
+
+    def read_doubles(self, n: int) -> Tuple[float, ...]:
+        values = struct.unpack_from(f'<{n}d', self.data, self.offset)
+        self.offset += 8 * n
+        return values
+
+    def read_dict(self) -> Dict[str, float]:
+        (n,) = self.read(_COUNT)
+        out = {}
+        for _ in range(n):
+            (length,) = self.read(_NAME)
+            name = self.data[self.offset:self.offset + length].decode('utf-8')
+            self.offset += length
+            (out[name],) = self.read(_VALUE)
+        return out
+
+
+def _pack_indices(buf: bytearray, items: List[Food], index: Dict[int, int]):
+    buf += _COUNT.pack(len(items))
+    buf += struct.pack(f'<{len(items)}I', *[index[id(f)] for f in items])
+
+
+def _pack_dict(buf: bytearray, values: Dict[str, float]):
+    buf += _COUNT.pack(len(values))
+    for name, value in values.items():
+        encoded = name.encode('utf-8')
+        buf += _NAME.pack(len(encoded))
+        buf += encoded
+        buf += _VALUE.pack(value)
+
+
+def save_checkpoint(path: str, world: World, agent: ShelterSeekingTardigrade, next_step: int):
+    """
+    Write world, agent and RNG state to `path`.
+
+    The file is written next to `path` and renamed into place, so a crash
+    mid-write leaves the previous checkpoint intact.
+    """
+    buf = bytearray(_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, next_step))
+
+    version, state, gauss_next = random.getstate()
+    buf += _RNG_HEAD.pack(version, len(state))
+    buf += struct.pack(f'<{len(state)}I', *state)
+    buf += _RNG_GAUSS.pack(gauss_next is not None, gauss_next or 0.0)
+
+    buf += _WORLD.pack(
+        world.width, world.height, world.next_id, world.tick,
+        world.scarcity_active, world.abundance_timer, world.scarcity_timer,
+        world.abundance_duration, world.scarcity_duration,
+        world.storm_active, world.calm_timer, world.storm_timer,
+        world.calm_duration, world.storm_duration, world.storm_intensity,
+    )
+
+    index = {id(f): i for i, f in enumerate(world.food)}
+    buf += _COUNT.pack(len(world.food))
+    for f in world.food:
+        buf += _FOOD.pack(f.id, f.x, f.y, f.nutrition, f.eaten, f.picked, f.in_bin, f.respawn_timer)
+
+    buf += _COUNT.pack(len(world.shelters))
+    for shelter in world.shelters:
+        buf += _BIN.pack(shelter.x, shelter.y, shelter.size, shelter.deposited, shelter.retrieved)
+        slots = shelter.slots()
+        buf += _COUNT.pack(len(slots))
+        buf += struct.pack(f'<{len(slots)}I', *slots)
+
+    memory = agent.shelter_location_memory
+    buf += _AGENT.pack(
+        agent.x, agent.y, agent.energy, agent.speed, agent.angle, agent.max_carry,
+        memory is not None, memory[0] if memory else 0.0, memory[1] if memory else 0.0,
+        agent.shelter_confidence, agent.is_resting, agent.rest_timer, agent.fatigue,
+        agent.in_shelter, agent.was_in_storm, agent.energy_before_storm,
+        agent.storm_exposure_total, agent.food_eaten, agent.food_picked,
+        agent.times_sheltered, agent.times_exposed, agent.rest_sessions,
+        agent.storms_survived,
+    )
+    _pack_indices(buf, agent.carried, index)
+    buf += _COUNT.pack(len(agent.shelter_memories))
+    for (mx, my), confidence in agent.shelter_memories.items():
+        buf += _MEMORY.pack(mx, my, confidence)
+    _pack_dict(buf, agent.action_values)
+    _pack_dict(buf, agent.weather_concepts)
+
+    monitor = agent.concept_monitor
+    buf += _FLAG.pack(monitor is not None)
+    if monitor is not None:
+        buf += _MONITOR.pack(
+            monitor.window, monitor.tol, monitor.diverge_window, monitor.diverge_above,
+            monitor.cycles, monitor.converged_step is not None, monitor.converged_step or 0,
+            monitor.diverged,
+        )
+        for magnitudes in (monitor.recent, monitor.history):
+            buf += _COUNT.pack(len(magnitudes))
+            buf += struct.pack(f'<{len(magnitudes)}d', *magnitudes)
+        _pack_dict(buf, monitor.cycle_deltas)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(buf)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Tuple[World, ShelterSeekingTardigrade, int]:
+    """Restore (world, agent, next_step) and the RNG state from `path`."""
+    with open(path, 'rb') as fh:
+        r = _Reader(fh.read())
+
+    magic, version, next_step = r.read(_HEADER)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError(f"{path} is not a shelter-seeking checkpoint")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+
+    rng_version, n = r.read(_RNG_HEAD)
+    rng_state = r.read_indices(n)
+    has_gauss, gauss_next = r.read(_RNG_GAUSS)
+
+    (width, height, next_id, tick,
+     scarcity_active, abundance_timer, scarcity_timer,
+     abundance_duration, scarcity_duration,
+     storm_active, calm_timer, storm_timer,
+     calm_duration, storm_duration, storm_intensity) = r.read(_WORLD)
+    # Constructing World and the agent draws from the RNG; the saved
+    # state is restored last, so those draws do not matter.
+    world = World(
+        width=width, height=height,
+        abundance_duration=abundance_duration, scarcity_duration=scarcity_duration,
+        calm_duration=calm_duration, storm_duration=storm_duration,
+    )
+    world.next_id = next_id
+    world.tick = tick
+    world.scarcity_active = scarcity_active
+    world.abundance_timer = abundance_timer
+    world.scarcity_timer = scarcity_timer
+    world.storm_active = storm_active
+    world.calm_timer = calm_timer
+    world.storm_timer = storm_timer
+    world.storm_intensity = storm_intensity
+
+    (n,) = r.read(_COUNT)
+    for _ in range(n):
+        fid, x, y, nutrition, eaten, picked, in_bin, respawn_timer = r.read(_FOOD)
+        world.food.append(Food(
+            x=x, y=y, id=fid, nutrition=nutrition, eaten=eaten,
+            picked=picked, in_bin=in_bin, respawn_timer=respawn_timer,
+        ))
+
+    (n_shelters,) = r.read(_COUNT)
+    world.reset_shelter_index(n_shelters)
+    for _ in range(n_shelters):
+        bx, by, size, deposited, retrieved = r.read(_BIN)
+        shelter = ShelterBin(x=bx, y=by, size=size, pool=world.food)
+        (n,) = r.read(_COUNT)
+        shelter.restore(world.food, list(r.read_indices(n)))
+        shelter.deposited = deposited
+        shelter.retrieved = retrieved
+        world.add_shelter(shelter)
+    world.bin = world.shelters[0] if world.shelters else None
+    world.n_shelters = n_shelters
+
+    (x, y, energy, speed, angle, max_carry,
+     has_memory, mem_x, mem_y, shelter_confidence, is_resting, rest_timer, fatigue,
+     in_shelter, was_in_storm, energy_before_storm, storm_exposure_total,
+     food_eaten, food_picked, times_sheltered, times_exposed, rest_sessions,
+     storms_survived) = r.read(_AGENT)
+    agent = ShelterSeekingTardigrade(x=x, y=y)
+    agent.energy = energy
+    agent.speed = speed
+    agent.angle = angle
+    agent.max_carry = max_carry
+    agent.shelter_location_memory = (mem_x, mem_y) if has_memory else None
+    agent.shelter_confidence = shelter_confidence
+    agent.is_resting = is_resting
+    agent.rest_timer = rest_timer
+    agent.fatigue = fatigue
+    agent.in_shelter = in_shelter
+    agent.was_in_storm = was_in_storm
+    agent.energy_before_storm = energy_before_storm
+    agent.storm_exposure_total = storm_exposure_total
+    agent.food_eaten = food_eaten
+    agent.food_picked = food_picked
+    agent.times_sheltered = times_sheltered
+    agent.times_exposed = times_exposed
+    agent.rest_sessions = rest_sessions
+    agent.storms_survived = storms_survived
+    (n,) = r.read(_COUNT)
+    agent.carried = [world.food[i] for i in r.read_indices(n)]
+    (n,) = r.read(_COUNT)
+    for _ in range(n):
+        mx, my, confidence = r.read(_MEMORY)
+        agent.shelter_memories[(mx, my)] = confidence
+    agent.action_values = r.read_dict()
+    agent.weather_concepts = r.read_dict()
+
+    (has_monitor,) = r.read(_FLAG)
+    if has_monitor:
+        (window, tol, diverge_window, diverge_above, cycles,
+         has_converged, converged_step, diverged) = r.read(_MONITOR)
+        monitor = ConvergenceMonitor(
+            window=window, tol=tol, diverge_window=diverge_window, diverge_above=diverge_above,
+        )
+        monitor.cycles = cycles
+        monitor.converged_step = converged_step if has_converged else None
+        monitor.diverged = diverged
+        for magnitudes in (monitor.recent, monitor.history):
+            (n,) = r.read(_COUNT)
+            magnitudes.extend(r.read_doubles(n))
+        monitor.cycle_deltas = r.read_dict()
+        agent.concept_monitor = monitor
+
+    random.setstate((rng_version, rng_state, gauss_next if has_gauss else None))
+    return world, agent, next_step
+
+
+def check_resume(steps: int = 30_000, split: int = 12_345, seed: int = 2):
+    """
+    Run `steps` steps straight through, then again with a save/load at
+    `split`, and check that both runs take the same actions and produce
+    byte-identical checkpoints (world, agent, monitor and RNG) shortly
+    after the split and at the end. With the default seed the split
+    falls mid-storm, with a monitor cycle still open.
+    """
+    def fresh():
+        random.seed(seed)
+        world = World(width=80, height=80, n_shelters=3)
+        for _ in range(10):
+            world.spawn_food()
+        world.bin.deposit_many(world.food[3:6])
+        world.bin.retrieve()
+        agent = ShelterSeekingTardigrade(x=60, y=60)
+        agent.carried.append(world.food[1])
+        agent.concept_monitor = ConvergenceMonitor(tol=1e-6)
+        return world, agent
+
+    marks = (split + 1_000, steps)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.ck')
+
+        def run(world, agent, start, actions, snapshots):
+            for step in range(start, steps):
+                actions.append(simulation_step(world, agent, step))
+                if step + 1 in marks:
+                    save_checkpoint(path, world, agent, step + 1)
+                    with open(path, 'rb') as fh:
+                        snapshots.append(fh.read())
+
+        straight, straight_snapshots = [], []
+        world, agent = fresh()
+        run(world, agent, 0, straight, straight_snapshots)
+
+        resumed, resumed_snapshots = [], []
+        world, agent = fresh()
+        for step in range(split):
+            resumed.append(simulation_step(world, agent, step))
+        save_checkpoint(path, world, agent, split)
+        random.seed(seed + 1)           # load must not depend on the live RNG
+        world, agent, start = load_checkpoint(path)
+        run(world, agent, start, resumed, resumed_snapshots)
+
+    assert resumed == straight, "resumed run took different actions"
+    for mark, got, expected in zip(marks, resumed_snapshots, straight_snapshots):
+        assert got == expected, f"resumed run is in a different state at step {mark}"
+    print(f"Resume at step {split} of {steps} is bit-identical "
+          f"({agent.storms_survived} storms, {agent.concept_monitor.cycles} monitor cycles)")
+
+if __name__ == '__main__':
+    check_resume()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Chunked, lazily generated large worlds for the shelter-seeking experiment.
+
+ChunkedWorld is a World whose area is split into square chunks.
+Nothing about a chunk exists until a tracked agent comes near it:
+
+- Weather and scarcity are closed-form functions of the world tick and a
+  per-chunk phase offset, so dormant chunks never need ticking.
+- Food is generated per chunk from a deterministic seed when the chunk
+  first becomes active, topped up while it stays active, and regional
+  richness varies from chunk to chunk.
+- Chunks away from every tracked agent go dormant. After `evict_after`
+  dormant ticks their food is packed into a flat array and the Food
+  objects are dropped; they are rebuilt when an agent returns.
+
+Step time depends on the number of active chunks, not on world area,
+and memory on the number of chunks visited.
+
+Unlike a plain World, agents must be registered with track(): food
+only exists in chunks around tracked agents, so an untracked agent
+senses none. World.food only holds food that has been deposited in a
+shelter (it is the bins' slot pool); everything else lives in chunks,
+so save_checkpoint does not cover a ChunkedWorld. simulation_step works
+unchanged: it respawns against live_food_count(), which counts food in
+the active chunks, and spawn_food() never fills the focus chunk past
+its food_target.
+"""
+
+import math
+import random
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from psudocode_shelter_seeking import (
+    Food,
+    Sensing,
+    ShelterSeekingTardigrade,
+    World,
+    WorldEvents,
+)
+
+
+@dataclass
+class Chunk:
+    """One square region of a ChunkedWorld."""
+    cx: int
+    cy: int
+    weather_offset: int
+    scarcity_offset: int
+    food_target: int
+    generation: int = 0
+    rng: Optional[random.Random] = None
+    food: Optional[List[Food]] = None
+    # Compact form while evicted: flat (x, y, nutrition, id) per live item
+    packed: Optional[array] = None
+    dormant_since: int = 0
+
+    @property
+    def hydrated(self) -> bool:
+        return self.food is not None
+
+
+@dataclass
+class ChunkedWorld(World):
+    """World split into lazily generated chunks (see module docstring)."""
+    width: float = 10_000.0
+    height: float = 10_000.0
+    seed: int = 0
+    chunk_size: float = 100.0
+    food_per_chunk: int = 8
+    active_radius: int = 1          # chunks around each agent kept active
+    evict_after: int = 500          # dormant ticks before a chunk is packed
+    respawn_every: int = 30
+
+    chunks: Dict[Tuple[int, int], Chunk] = field(default_factory=dict, init=False, repr=False, compare=False)
+    active: Dict[Tuple[int, int], Chunk] = field(default_factory=dict, init=False, repr=False, compare=False)
+    dormant: Dict[Tuple[int, int], Chunk] = field(default_factory=dict, init=False, repr=False, compare=False)
+    tracked: List[ShelterSeekingTardigrade] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.nx = max(1, int(math.ceil(self.width / self.chunk_size)))
+        self.ny = max(1, int(math.ceil(self.height / self.chunk_size)))
+        self._anchors: List[Tuple[int, int]] = []
+
+    # --------------------------------------------------------
+    # Chunk lifecycle
+    # --------------------------------------------------------
+
+    def track(self, agent: ShelterSeekingTardigrade):
+        """Keep the chunks around `agent` active. The first agent tracked
+        also decides the weather reported through storm_active etc."""
+        self.tracked.append(agent)
+        self._refresh_active()
+
+    def chunk_key(self, x: float, y: float) -> Tuple[int, int]:
+        cx = min(self.nx - 1, max(0, int(x // self.chunk_size)))
+        cy = min(self.ny - 1, max(0, int(y // self.chunk_size)))
+        return cx, cy
+
+    def chunk_at(self, cx: int, cy: int) -> Chunk:
+        """Chunk metadata, created from the seed on first access (no food)."""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            rng = random.Random(f"{self.seed}:{cx}:{cy}")
+            chunk = Chunk(
+                cx=cx,
+                cy=cy,
+                weather_offset=rng.randrange(self.calm_duration + self.storm_duration),
+                scarcity_offset=rng.randrange(self.abundance_duration + self.scarcity_duration),
+                food_target=rng.randint(0, 2 * self.food_per_chunk),
+            )
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def _hydrate(self, chunk: Chunk):
+        chunk.rng = random.Random(f"{self.seed}:{chunk.cx}:{chunk.cy}:{chunk.generation}")
+        chunk.generation += 1
+        chunk.food = []
+        if chunk.packed is not None:
+            p = chunk.packed
+            for i in range(0, len(p), 4):
+                chunk.food.append(Food(x=p[i], y=p[i + 1], nutrition=p[i + 2], id=int(p[i + 3])))
+            chunk.packed = None
+        self._top_up(chunk)
+
+    def _evict(self, chunk: Chunk):
+        packed = array('d')
+        for f in chunk.food:
+            if not (f.eaten or f.picked or f.in_bin):
+                packed.extend((f.x, f.y, f.nutrition, f.id))
+        chunk.packed = packed
+        chunk.food = None
+        chunk.rng = None
+
+    def _refresh_active(self):
+        anchors = [self.chunk_key(agent.x, agent.y) for agent in self.tracked]
+        if anchors == self._anchors and self.tick % self.respawn_every:
+            return
+        self._anchors = anchors
+
+        wanted = set()
+        r = self.active_radius
+        for cx, cy in anchors:
+            for i in range(max(0, cx - r), min(self.nx, cx + r + 1)):
+                for j in range(max(0, cy - r), min(self.ny, cy + r + 1)):
+                    wanted.add((i, j))
+
+        for key in list(self.active):
+            if key not in wanted:
+                chunk = self.active.pop(key)
+                chunk.dormant_since = self.tick
+                self.dormant[key] = chunk
+        for key in wanted:
+            if key not in self.active:
+                chunk = self.dormant.pop(key, None) or self.chunk_at(*key)
+                if not chunk.hydrated:
+                    self._hydrate(chunk)
+                self.active[key] = chunk
+
+        # Pack chunks that have been dormant for a while
+        if self.tick % self.respawn_every == 0:
+            for key in [k for k, c in self.dormant.items()
+                        if self.tick - c.dormant_since >= self.evict_after]:
+                self._evict(self.dormant.pop(key))
+
+    # --------------------------------------------------------
+    # Regional weather and scarcity (closed form, no ticking)
+    # --------------------------------------------------------
+
+    def chunk_weather(self, chunk: Chunk) -> Tuple[bool, float]:
+        """(storm_active, storm_intensity) for a chunk at the current tick."""
+        cycle = self.calm_duration + self.storm_duration
+        phase = (self.tick + chunk.weather_offset) % cycle
+        if phase < self.calm_duration:
+            return False, 0.0
+        storm_timer = cycle - phase
+        if storm_timer == self.storm_duration:
+            return True, 0.3
+        return True, 0.5 + 0.5 * math.sin(storm_timer * 0.1)
+
+    def chunk_scarce(self, chunk: Chunk) -> bool:
+        cycle = self.abundance_duration + self.scarcity_duration
+        return (self.tick + chunk.scarcity_offset) % cycle >= self.abundance_duration
+
+    # --------------------------------------------------------
+    # World interface
+    # --------------------------------------------------------
+
+    def _focus_chunk(self) -> Chunk:
+        if self.tracked:
+            return self.chunk_at(*self.chunk_key(self.tracked[0].x, self.tracked[0].y))
+        return self.chunk_at(*self.chunk_key(self.bin.x, self.bin.y))
+
+    @staticmethod
+    def _live_count(chunk: Chunk) -> int:
+        return sum(1 for f in chunk.food if not (f.eaten or f.picked or f.in_bin))
+
+    def _top_up(self, chunk: Chunk):
+        if self.chunk_scarce(chunk):
+            return
+        for _ in range(chunk.food_target - self._live_count(chunk)):
+            self.spawn_food(chunk)
+
+    def spawn_food(self, chunk: Optional[Chunk] = None) -> Optional[Food]:
+        """
+        Spawn one food item inside `chunk`. With no chunk given, spawn in
+        the focus chunk unless it already holds its food_target.
+        """
+        capped = chunk is None
+        if capped:
+            chunk = self._focus_chunk()
+        if not chunk.hydrated:
+            self._hydrate(chunk)
+        if capped and self._live_count(chunk) >= chunk.food_target:
+            return None
+        if self.chunk_scarce(chunk):
+            return None
+        x0 = chunk.cx * self.chunk_size
+        y0 = chunk.cy * self.chunk_size
+        f = Food(
+            x=chunk.rng.uniform(x0, min(x0 + self.chunk_size, self.width)),
+            y=chunk.rng.uniform(y0, min(y0 + self.chunk_size, self.height)),
+            id=self.next_id,
+            nutrition=chunk.rng.uniform(0.4, 0.6),
+        )
+        self.next_id += 1
+        chunk.food.append(f)
+        return f
+
+    def update(self) -> WorldEvents:
+        """Advance the tick and report weather for the focus chunk."""
+        self.tick += 1
+        self._refresh_active()
+
+        chunk = self._focus_chunk()
+        storm, intensity = self.chunk_weather(chunk)
+        events = self.events
+        events.storm_started = storm and not self.storm_active
+        events.storm_ended = self.storm_active and not storm
+        events.storm = storm
+        self.storm_active = storm
+        self.storm_intensity = intensity
+        self.scarcity_active = events.scarcity = self.chunk_scarce(chunk)
+
+        if self.tick % self.respawn_every == 0:
+            for c in self.active.values():
+                self._top_up(c)
+
+        return events
+
+    def _chunks_near(self, x: float, y: float, radius: float):
+        cx0, cy0 = self.chunk_key(x - radius, y - radius)
+        cx1, cy1 = self.chunk_key(x + radius, y + radius)
+        for i in range(cx0, cx1 + 1):
+            for j in range(cy0, cy1 + 1):
+                chunk = self.chunks.get((i, j))
+                if chunk is not None and chunk.hydrated:
+                    yield chunk
+
+    def get_nearby_food(self, x: float, y: float, radius: float) -> List[Food]:
+        nearby = []
+        for chunk in self._chunks_near(x, y, radius):
+            for f in chunk.food:
+                if f.eaten or f.picked or f.in_bin:
+                    continue
+                dist = math.sqrt((f.x - x)**2 + (f.y - y)**2)
+                if dist < radius:
+                    nearby.append(f)
+        return nearby
+
+    def nearby_food_into(self, x: float, y: float, radius: float, sensing: Sensing) -> int:
+        objs = sensing.food
+        dists = sensing.food_dist
+        r2 = radius * radius
+        n = 0
+        for chunk in self._chunks_near(x, y, radius):
+            for f in chunk.food:
+                if f.eaten or f.picked or f.in_bin:
+                    continue
+                dx = f.x - x
+                dy = f.y - y
+                d2 = dx * dx + dy * dy
+                if d2 < r2:
+                    if n == len(objs):
+                        objs.append(f)
+                        dists.append(0.0)
+                    objs[n] = f
+                    dists[n] = math.sqrt(d2)
+                    n += 1
+        sensing.food_count = n
+        return n
+
+    def get_exposure(self, x: float, y: float) -> float:
+        """Exposure from the weather of the chunk containing (x, y)."""
+        if self.is_sheltered(x, y):
+            return 0.0
+        return self.chunk_weather(self.chunk_at(*self.chunk_key(x, y)))[1]
+
+    def live_food_count(self) -> int:
+        """Food on the ground in the active chunks."""
+        return sum(self._live_count(c) for c in self.active.values())
+
+
+def run_chunked_experiment(steps: int = 20000, size: float = 10_000.0):
+    """
+    Walk one agent across a large chunked world.
+
+    Agent movement is redacted in this build, so the demo drags the agent
+    along a diagonal to exercise chunk activation and eviction.
+    """
+    random.seed(0)
+    world = ChunkedWorld(width=size, height=size)
+    agent = ShelterSeekingTardigrade(x=50.0, y=50.0)
+    world.track(agent)
+
+    print(f"Walking a {size:.0f}x{size:.0f} world for {steps} steps...")
+    t0 = time.perf_counter()
+    for step in range(steps):
+        events = world.update()
+        if events.storm_started:
+            agent.observe_storm_start(world)
+        if events.storm_ended:
+            agent.observe_storm_end()
+        agent.step(world)
+        agent.x = agent.y = min(size - 1, agent.x + 0.5)
+    elapsed = time.perf_counter() - t0
+
+    print(f"  {steps / elapsed:,.0f} steps/s")
+    print(f"  chunks: {world.nx * world.ny} total, {len(world.chunks)} visited, "
+          f"{len(world.active)} active, {len(world.dormant)} dormant")
+    print(f"  live food near agent: {world.live_food_count()}")
+    print(f"  storms survived: {agent.storms_survived}")
+
+
+if __name__ == '__main__':
+    run_chunked_experiment()
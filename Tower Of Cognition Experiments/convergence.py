@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Convergence detection for the shelter-seeking experiment.
+
+A ConvergenceMonitor is attached to an agent as `concept_monitor`; the
+agent reports every concept / action-value update to it, and
+simulation_step closes a cycle each time a storm ends. run_experiment
+and parameter_sweep.py stop a run once it reports converged (or
+diverged).
+
+    monitor = ConvergenceMonitor(window=5, tol=1e-3)
+    run_experiment(steps=1_000_000, monitor=monitor)
+    monitor.converged_step
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+
+class ConvergenceMonitor:
+    """
+    Watches how much learning is still happening.
+
+    Every weather_concepts / action_values update is accumulated per
+    name over the current storm cycle; a cycle closes when a storm ends
+    and its magnitude is the summed absolute net change. Net rather than
+    gross change, so an agent whose in-storm and storm-end updates pull
+    a concept back and forth to the same value counts as settled.
+    Concepts are converged once each of the last `window` cycles moved
+    them by less than `tol`.
+
+    Learning here cannot blow up (every update moves a value part of the
+    way to a bounded target), so divergence means never settling: the
+    mean magnitude over the last `diverge_window` cycles is still above
+    `diverge_above` and no smaller than over the `diverge_window` cycles
+    before. A run that is still converging shrinks from block to block;
+    one whose climate keeps the concepts oscillating does not. A
+    non-finite magnitude also counts as diverged.
+    """
+
+    def __init__(self, window: int = 5, tol: float = 1e-3,
+                 diverge_window: int = 20, diverge_above: float = 1e-2):
+        self.window = window
+        self.tol = tol
+        self.diverge_window = diverge_window
+        self.diverge_above = diverge_above
+        self.cycle_deltas: Dict[str, float] = {}
+        self.recent = deque(maxlen=window)
+        self.history = deque(maxlen=2 * diverge_window)
+        self.cycles = 0
+        self.converged_step: Optional[int] = None
+        self.diverged = False
+
+    def record(self, name: str, delta: float):
+        deltas = self.cycle_deltas
+        deltas[name] = deltas.get(name, 0.0) + delta
+
+    def end_cycle(self, step: int) -> bool:
+        """Close a storm cycle. Returns True once converged."""
+        deltas = self.cycle_deltas
+        magnitude = 0.0
+        for name, delta in deltas.items():
+            magnitude += abs(delta)
+            deltas[name] = 0.0
+        self.recent.append(magnitude)
+        self.history.append(magnitude)
+        self.cycles += 1
+        if (self.converged_step is None and len(self.recent) == self.window
+                and max(self.recent) < self.tol):
+            self.converged_step = step
+        if not self.converged and not self.diverged:
+            self.diverged = not math.isfinite(magnitude) or self._not_settling()
+        return self.converged_step is not None
+
+    def _not_settling(self) -> bool:
+        history = self.history
+        n = self.diverge_window
+        if len(history) < 2 * n:
+            return False
+        earlier = sum(history[i] for i in range(n)) / n
+        later = sum(history[i] for i in range(n, 2 * n)) / n
+        return later > self.diverge_above and later >= earlier
+
+    @property
+    def converged(self) -> bool:
+        return self.converged_step is not None
+
+    def resume_from(self, saved: 'ConvergenceMonitor'):
+        """Carry on from a checkpointed monitor's history, keeping this
+        monitor's window and tolerances."""
+        self.cycle_deltas = dict(saved.cycle_deltas)
+        self.recent = deque(saved.recent, maxlen=self.window)
+        self.history = deque(saved.history, maxlen=2 * self.diverge_window)
+        self.cycles = saved.cycles
+        self.converged_step = saved.converged_step
+        self.diverged = saved.diverged
+
+    def report(self):
+        if self.converged:
+            print(f"\nConcepts converged at step {self.converged_step} "
+                  f"(after {self.cycles} storm cycles)")
+        elif self.diverged:
+            print(f"\nConcepts not settling after {self.cycles} storm cycles (diverged)")
+        else:
+            print(f"\nConcepts not converged after {self.cycles} storm cycles")
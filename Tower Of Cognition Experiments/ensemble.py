@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Vectorized ensemble of independent shelter-seeking worlds.
+
+ShelterEnsemble advances K independent World + ShelterSeekingTardigrade
+pairs in lockstep. Every piece of per-world and per-agent state is a
+length-K numpy array, and one tick applies the rules of
+
+- World.update            (weather and scarcity timers, storm intensity)
+- ShelterBin.is_inside     (exposure)
+- observe_storm_start/end  (storm-end concept consolidation)
+- ShelterSeekingTardigrade.step / sense_shelter
+                           (energy and fatigue decay, in-storm concept
+                            updates, shelter memory)
+
+to all K at once. Updates use the same float expressions as the scalar
+code, so given the same timer jitter a member of the ensemble follows
+its scalar counterpart exactly. Jitter comes from a numpy Generator, so
+the streams differ from the `random` module's.
+
+In this redacted build `_execute` does not move the agent or touch
+food, so positions stay where they start and food is not modelled.
+
+    python ensemble.py --check    # members match scalar runs exactly
+"""
+
+import random
+import sys
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from psudocode_shelter_seeking import (
+    ShelterSeekingTardigrade,
+    World,
+    _update_association,
+    simulation_step,
+)
+
+
+CONCEPTS = ('storm_is_bad', 'shelter_protects', 'seek_when_storm', 'rest_recovers')
+
+
+class ShelterEnsemble:
+    """K independent shelter-seeking simulations as parallel arrays."""
+
+    def __init__(self, k: int, seed: Optional[int] = None,
+                 agent_x: float = 60.0, agent_y: float = 60.0,
+                 calm_duration: int = 400, storm_duration: int = 200,
+                 abundance_duration: int = 600, scarcity_duration: int = 300,
+                 shelter_size: float = 10.0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.calm_duration = calm_duration
+        self.storm_duration = storm_duration
+        self.abundance_duration = abundance_duration
+        self.scarcity_duration = scarcity_duration
+        self.steps = 0
+
+        # World: weather and scarcity cycles (World.__post_init__)
+        self.storm_active = np.zeros(k, dtype=bool)
+        self.calm_timer = np.full(k, calm_duration, dtype=np.int64)
+        self.storm_timer = np.zeros(k, dtype=np.int64)
+        self.storm_intensity = np.zeros(k)
+        self.scarcity_active = np.zeros(k, dtype=bool)
+        self.abundance_timer = np.full(k, abundance_duration, dtype=np.int64)
+        self.scarcity_timer = np.zeros(k, dtype=np.int64)
+
+        # Shelter bin
+        self.bin_x = self.rng.uniform(15, 30, k)
+        self.bin_y = self.rng.uniform(15, 30, k)
+        self.bin_size = np.full(k, shelter_size)
+
+        # Agent
+        self.x = np.full(k, agent_x)
+        self.y = np.full(k, agent_y)
+        self.energy = np.full(k, 0.5)
+        self.fatigue = np.zeros(k)
+        self.in_shelter = np.zeros(k, dtype=bool)
+        self.shelter_confidence = np.zeros(k)
+        self.was_in_storm = np.zeros(k, dtype=bool)
+        self.energy_before_storm = np.full(k, 0.5)
+        self.storm_exposure_total = np.zeros(k)
+        self.seek_shelter_value = np.zeros(k)
+        self.concepts: Dict[str, np.ndarray] = {name: np.zeros(k) for name in CONCEPTS}
+
+        # Stats
+        self.times_exposed = np.zeros(k, dtype=np.int64)
+        self.storms_survived = np.zeros(k, dtype=np.int64)
+
+    def _jitter(self, low: int, high: int, mask: np.ndarray) -> np.ndarray:
+        """Inclusive integer jitter, like random.randint(low, high), for
+        each world selected by `mask`, in index order."""
+        return self.rng.integers(low, high + 1, int(mask.sum()))
+
+    def _update_world(self):
+        """World.update for all K. Returns (storm_started, storm_ended) masks."""
+        was_storm = self.storm_active
+        calm = ~was_storm
+
+        self.storm_timer -= was_storm
+        self.calm_timer -= calm
+        intensity = np.where(was_storm, 0.5 + 0.5 * np.sin(self.storm_timer * 0.1), 0.0)
+
+        ended = was_storm & (self.storm_timer <= 0)
+        started = calm & (self.calm_timer <= 0)
+        if ended.any():
+            self.calm_timer[ended] = self.calm_duration + self._jitter(-50, 50, ended)
+            intensity[ended] = 0.0
+        if started.any():
+            self.storm_timer[started] = self.storm_duration + self._jitter(-30, 30, started)
+            intensity[started] = 0.3
+        self.storm_active = (was_storm & ~ended) | started
+        self.storm_intensity = intensity
+
+        was_scarce = self.scarcity_active
+        plenty = ~was_scarce
+        self.scarcity_timer -= was_scarce
+        self.abundance_timer -= plenty
+        scarcity_over = was_scarce & (self.scarcity_timer <= 0)
+        scarcity_begins = plenty & (self.abundance_timer <= 0)
+        self.abundance_timer[scarcity_over] = self.abundance_duration
+        self.scarcity_timer[scarcity_begins] = self.scarcity_duration
+        self.scarcity_active = (was_scarce & ~scarcity_over) | scarcity_begins
+
+        return started, ended
+
+    def _observe_storms(self, started: np.ndarray, ended: np.ndarray):
+        """observe_storm_start / observe_storm_end for all K."""
+        self.was_in_storm |= started
+        self.energy_before_storm = np.where(started, self.energy, self.energy_before_storm)
+        self.storm_exposure_total[started] = 0.0
+
+        done = ended & self.was_in_storm
+        if not done.any():
+            return
+        c = self.concepts
+        energy_lost = self.energy_before_storm - self.energy
+
+        bad = done & (self.storm_exposure_total > 10)
+        c['storm_is_bad'] = np.where(
+            bad,
+            _update_association(c['storm_is_bad'], np.minimum(1.0, energy_lost * 3), 0.2),
+            c['storm_is_bad'],
+        )
+        c['seek_when_storm'] = np.where(
+            bad, _update_association(c['seek_when_storm'], 0.7, 0.15), c['seek_when_storm'],
+        )
+
+        safe = done & (self.storm_exposure_total < 5) & (energy_lost < 0.1)
+        c['shelter_protects'] = np.where(
+            safe, _update_association(c['shelter_protects'], 0.9, 0.2), c['shelter_protects'],
+        )
+        self.seek_shelter_value = np.where(
+            safe, _update_association(self.seek_shelter_value, 0.8, 0.15), self.seek_shelter_value,
+        )
+
+        self.storms_survived += done
+        self.was_in_storm &= ~done
+
+    def _step_agents(self):
+        """The state-changing part of ShelterSeekingTardigrade.step for all K."""
+        dx = self.bin_x - self.x
+        dy = self.bin_y - self.y
+        dist = np.sqrt(dx * dx + dy * dy)
+        inside = dist < self.bin_size
+
+        # Energy decay (faster in storms when exposed)
+        exposure = np.where(inside, 0.0, self.storm_intensity)
+        total_decay = 0.001 + exposure * 0.004 + np.where(self.scarcity_active, 0.001, 0.0)
+        self.energy = np.maximum(0.0, self.energy - total_decay)
+        self.fatigue = np.minimum(1.0, self.fatigue + 0.0005)
+
+        # Exposure tracking and in-storm concept updates
+        storm = self.storm_active
+        self.storm_exposure_total += np.where(storm, exposure, 0.0)
+        exposed = storm & (exposure > 0.1)
+        self.times_exposed += exposed
+        c = self.concepts
+        c['storm_is_bad'] = np.where(
+            exposed, _update_association(c['storm_is_bad'], exposure, 0.05), c['storm_is_bad'],
+        )
+        protected = storm & self.in_shelter
+        c['shelter_protects'] = np.where(
+            protected, _update_association(c['shelter_protects'], 0.6, 0.05), c['shelter_protects'],
+        )
+
+        # sense_shelter: memory and in_shelter only refresh within range
+        near = dist < 50.0
+        self.shelter_confidence = np.where(
+            near, np.minimum(1.0, self.shelter_confidence + 0.15), self.shelter_confidence,
+        )
+        self.in_shelter = np.where(near, inside, self.in_shelter)
+
+    def step(self):
+        """Advance all K simulations by one tick."""
+        started, ended = self._update_world()
+        self._observe_storms(started, ended)
+        self._step_agents()
+        self.steps += 1
+
+    def run(self, steps: int):
+        for _ in range(steps):
+            self.step()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean/std/min/max across the ensemble for concepts and stats."""
+        series = dict(self.concepts)
+        series['seek_shelter_value'] = self.seek_shelter_value
+        series['energy'] = self.energy
+        series['storms_survived'] = self.storms_survived
+        series['times_exposed'] = self.times_exposed
+        return {
+            name: {
+                'mean': float(v.mean()),
+                'std': float(v.std()),
+                'min': float(v.min()),
+                'max': float(v.max()),
+            }
+            for name, v in series.items()
+        }
+
+
+def run_ensemble(k: int = 1000, steps: int = 10000, seed: int = 0):
+    """Run K seeds of the shelter experiment and report concept spread."""
+    ensemble = ShelterEnsemble(k, seed=seed)
+
+    print(f"Running {k} worlds for {steps} steps...")
+    t0 = time.perf_counter()
+    ensemble.run(steps)
+    elapsed = time.perf_counter() - t0
+    print(f"  {k * steps / elapsed:,.0f} world-steps/s ({elapsed:.2f}s)")
+
+    print(f"\n{'':<22}{'mean':>8}{'std':>8}{'min':>8}{'max':>8}")
+    for name, s in ensemble.summary().items():
+        print(f"  {name:<20}{s['mean']:>8.2f}{s['std']:>8.2f}{s['min']:>8.2f}{s['max']:>8.2f}")
+
+
+def check_against_scalar(steps: int = 30_000, seed: int = 0):
+    """
+    Step scalar World + ShelterSeekingTardigrade pairs alongside an
+    ensemble and check that every member's state matches its scalar
+    counterpart exactly after every step.
+
+    Each world gets its own pinned jitter stream, fed to World.update
+    through random.randint and to the ensemble through _jitter. Every
+    bin is at (20, 25); agents sit inside it, exactly on its edge, in
+    sensing range, exactly at the sensing limit, and far away.
+    """
+    random.seed(seed)
+    positions = [(23.0, 23.0), (30.0, 25.0), (40.0, 40.0), (20.0, 75.0), (190.0, 190.0)]
+    worlds = []
+    agents = []
+    for x, y in positions:
+        world = World(width=200, height=200)
+        world.bin.x, world.bin.y = 20.0, 25.0
+        world.reset_shelter_index(1)
+        world.add_shelter(world.bin)
+        for _ in range(10):
+            world.spawn_food()
+        worlds.append(world)
+        agents.append(ShelterSeekingTardigrade(x=x, y=y))
+
+    ensemble = ShelterEnsemble(len(worlds), seed=seed)
+    ensemble.bin_x = np.array([world.bin.x for world in worlds])
+    ensemble.bin_y = np.array([world.bin.y for world in worlds])
+    ensemble.x = np.array([agent.x for agent in agents])
+    ensemble.y = np.array([agent.y for agent in agents])
+
+    streams = [random.Random(f"{seed}:{i}") for i in range(len(worlds))]
+    ensemble_streams = [random.Random(f"{seed}:{i}") for i in range(len(worlds))]
+    ensemble._jitter = lambda low, high, mask: np.array(
+        [ensemble_streams[i].randint(low, high) for i in np.flatnonzero(mask)], dtype=np.int64,
+    )
+
+    def mismatches(i: int, agent: ShelterSeekingTardigrade):
+        e = ensemble
+        pairs = {name: (e.concepts[name][i], agent.weather_concepts[name]) for name in CONCEPTS}
+        pairs.update({
+            'seek_shelter_value': (e.seek_shelter_value[i], agent.action_values['seek_shelter']),
+            'energy': (e.energy[i], agent.energy),
+            'fatigue': (e.fatigue[i], agent.fatigue),
+            'in_shelter': (e.in_shelter[i], agent.in_shelter),
+            'shelter_confidence': (e.shelter_confidence[i], agent.shelter_confidence),
+            'storm_exposure_total': (e.storm_exposure_total[i], agent.storm_exposure_total),
+            'storms_survived': (e.storms_survived[i], agent.storms_survived),
+            'times_exposed': (e.times_exposed[i], agent.times_exposed),
+        })
+        return [name for name, (got, want) in pairs.items() if got != want]
+
+    randint = random.randint
+    try:
+        for step in range(steps):
+            for i, (world, agent) in enumerate(zip(worlds, agents)):
+                random.randint = streams[i].randint
+                simulation_step(world, agent, step)
+            random.randint = randint
+            ensemble.step()
+            for i, agent in enumerate(agents):
+                bad = mismatches(i, agent)
+                assert not bad, f"member {i} differs from its scalar run at step {step}: {bad}"
+    finally:
+        random.randint = randint
+
+    storms = ', '.join(str(agent.storms_survived) for agent in agents)
+    print(f"{len(worlds)} ensemble members match their scalar runs over {steps} steps "
+          f"(storms survived: {storms})")
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        check_against_scalar()
+    else:
+        run_ensemble()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Run harness for the shelter-seeking experiment.
+
+run_experiment drives one World + ShelterSeekingTardigrade pair through
+simulation_step and wires in the optional pieces that live in their own
+modules: checkpoints (checkpoint.py), per-phase profiling
+(profiling.py), trajectory recording (trajectory_recorder.py) and early
+stopping (convergence.py).
+
+    python experiment.py
+"""
+
+import os
+from typing import Optional
+
+from checkpoint import load_checkpoint, save_checkpoint
+from convergence import ConvergenceMonitor
+from profiling import PhaseProfiler, profiling_requested
+from psudocode_shelter_seeking import ShelterSeekingTardigrade, World, simulation_step
+
+
+def run_experiment(steps: int = 10000,
+                   checkpoint_path: Optional[str] = None,
+                   checkpoint_every: int = 100_000,
+                   resume: bool = False,
+                   profile: Optional[bool] = None,
+                   recorder=None,
+                   monitor: Optional[ConvergenceMonitor] = None,
+                   stop_on_convergence: bool = True):
+    """
+    Run the shelter-seeking experiment.
+
+    With `checkpoint_path` set, state is saved every `checkpoint_every`
+    steps and at the end. With `resume`, an existing checkpoint at that
+    path is loaded and the run continues from where it stopped.
+    Per-phase profiling is on when `profile` is True, or when it is left
+    as None and VINE_PROFILE is set. A `recorder` (see
+    trajectory_recorder.py) is sampled after every step. With a
+    `monitor`, the run ends early once concepts have converged (unless
+    `stop_on_convergence` is False); monitor.converged_step records when.
+    On resume, `monitor` continues from the convergence history saved
+    in the checkpoint.
+    """
+    start = 0
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        world, agent, start = load_checkpoint(checkpoint_path)
+        print(f"Resumed from {checkpoint_path} at step {start}")
+    else:
+        world = World(width=80, height=80)
+
+        # Spawn initial food
+        for _ in range(10):
+            world.spawn_food()
+
+        # Create agent (starts far from shelter)
+        agent = ShelterSeekingTardigrade(x=60, y=60)
+
+    if monitor is not None and agent.concept_monitor is not None:
+        monitor.resume_from(agent.concept_monitor)
+    agent.concept_monitor = monitor
+
+    profiler = None
+    if profile or (profile is None and profiling_requested()):
+        profiler = PhaseProfiler()
+        profiler.instrument(world, agent)
+
+    print(f"Training for {steps} steps...")
+
+    end = steps
+    if stop_on_convergence and monitor is not None and monitor.converged:
+        end = start         # already converged when checkpointed
+    for step in range(start, end):
+        action = simulation_step(world, agent, step)
+        if recorder is not None:
+            recorder.record(step, agent, world, action)
+
+        if checkpoint_path and (step + 1) % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, world, agent, step + 1)
+
+        if stop_on_convergence and monitor is not None and monitor.converged:
+            end = step + 1
+            break
+
+    if checkpoint_path and start < end:
+        save_checkpoint(checkpoint_path, world, agent, end)
+
+    # Report results
+    print(f"\nResults:")
+    print(f"  Storms survived: {agent.storms_survived}")
+    print(f"  Times sheltered: {agent.times_sheltered}")
+    print(f"  Times exposed: {agent.times_exposed}")
+    print(f"  Final energy: {agent.energy:.2f}")
+    print(f"\nLearned concepts:")
+    print(f"  storm_is_bad: {agent.weather_concepts['storm_is_bad']:.2f}")
+    print(f"  shelter_protects: {agent.weather_concepts['shelter_protects']:.2f}")
+
+    if monitor is not None:
+        monitor.report()
+
+    if profiler is not None:
+        profiler.report()
+
+
+if __name__ == '__main__':
+    run_experiment()
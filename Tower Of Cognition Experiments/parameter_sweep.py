@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Parallel parameter sweeps over World climate settings.
+
+A sweep spec names the parameters to vary and how:
+
+    {
+      "grid":   {"calm_duration": [200, 400, 800], "storm_duration": [100, 200]},
+      "random": {"scarcity_duration": [100, 600]},    # optional, uniform ints/floats
+      "samples": 20,                                  # random draws per grid point
+      "seeds": [0, 1, 2, 3],
+      "steps": 10000
+    }
+
+Sweepable parameters are the World durations (calm_duration,
+storm_duration, abundance_duration, scarcity_duration) and
+food_density (live food items per 100x100 area). Every
+(configuration, seed) pair is one job. Jobs run on a process pool, stop
+early once a ConvergenceMonitor reports the agent's concepts settled
+(converged) or still swinging with no sign of settling (diverged), and
+are cached on disk as one JSON file each, so an interrupted sweep picks
+up where it left off.
+
+    python parameter_sweep.py spec.json --workers 8 --cache sweep_cache
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convergence import ConvergenceMonitor
+from psudocode_shelter_seeking import ShelterSeekingTardigrade, World, simulation_step
+
+
+WORLD_PARAMS = ('calm_duration', 'storm_duration', 'abundance_duration', 'scarcity_duration')
+SWEEP_PARAMS = WORLD_PARAMS + ('food_density',)
+
+# run_experiment's world: 80x80 holding 8 food items
+DEFAULT_CONFIG = {
+    'calm_duration': 400,
+    'storm_duration': 200,
+    'abundance_duration': 600,
+    'scarcity_duration': 300,
+    'food_density': 12.5,
+}
+WORLD_SIZE = 80.0
+
+# Early stopping: storm cycles the concepts must stay within `tol` for
+WINDOW = 5
+
+
+def expand_spec(spec: Dict) -> List[Dict]:
+    """All configurations described by a sweep spec."""
+    unknown = set(spec.get('grid', {})) | set(spec.get('random', {}))
+    unknown -= set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    grid = spec.get('grid', {})
+    ranges = spec.get('random', {})
+    rng = random.Random(spec.get('sample_seed', 0))
+    samples = spec.get('samples', 1) if ranges else 1
+
+    configs = []
+    names = list(grid)
+    for values in itertools.product(*(grid[n] for n in names)):
+        for _ in range(samples):
+            config = dict(DEFAULT_CONFIG, **dict(zip(names, values)))
+            for name, (lo, hi) in ranges.items():
+                if isinstance(lo, int) and isinstance(hi, int):
+                    config[name] = rng.randint(lo, hi)
+                else:
+                    config[name] = rng.uniform(lo, hi)
+            configs.append(config)
+    return configs
+
+
+def job_key(config: Dict, seed: int, steps: int, tol: float) -> str:
+    payload = json.dumps({'config': config, 'seed': seed, 'steps': steps, 'tol': tol}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def run_config(config: Dict, seed: int, steps: int, tol: float) -> Dict:
+    """Run one (configuration, seed) job, stopping early when settled."""
+    random.seed(seed)
+    world = World(width=WORLD_SIZE, height=WORLD_SIZE, **{k: config[k] for k in WORLD_PARAMS})
+    food_target = max(1, round(config['food_density'] * WORLD_SIZE * WORLD_SIZE / 10_000))
+    for _ in range(food_target + 2):
+        world.spawn_food()
+    agent = ShelterSeekingTardigrade(x=60, y=60)
+    monitor = ConvergenceMonitor(window=WINDOW, tol=tol)
+    agent.concept_monitor = monitor
+
+    status = 'completed'
+    step = 0
+    while step < steps:
+        simulation_step(world, agent, step, food_target=food_target)
+        step += 1
+        if monitor.diverged:
+            status = 'diverged'
+            break
+        if monitor.converged:
+            status = 'converged'
+            break
+
+    return {
+        'config': config,
+        'seed': seed,
+        'status': status,
+        'steps_run': step,
+        'converged_step': monitor.converged_step,
+        'weather_concepts': dict(agent.weather_concepts),
+        'action_values': dict(agent.action_values),
+        'storms_survived': agent.storms_survived,
+        'times_exposed': agent.times_exposed,
+    }
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as fh:
+        json.dump(data, fh)
+    os.replace(tmp_path, path)
+
+
+def run_sweep(spec: Dict, cache_dir: str, workers: int = None, tol: float = 1e-3) -> List[Dict]:
+    """Run every job in the spec not already cached. Returns all results."""
+    os.makedirs(cache_dir, exist_ok=True)
+    steps = spec.get('steps', 10000)
+    seeds = spec.get('seeds', [0])
+
+    results = []
+    pending = []
+    for config in expand_spec(spec):
+        for seed in seeds:
+            path = os.path.join(cache_dir, job_key(config, seed, steps, tol) + '.json')
+            if os.path.exists(path):
+                with open(path) as fh:
+                    results.append(json.load(fh))
+            else:
+                pending.append((path, config, seed))
+
+    print(f"{len(results)} cached, {len(pending)} to run")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_config, config, seed, steps, tol): path
+            for path, config, seed in pending
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            _write_json(futures[future], result)
+            results.append(result)
+            print(f"  [{done}/{len(pending)}] seed={result['seed']} "
+                  f"{result['status']} after {result['steps_run']} steps", flush=True)
+    return results
+
+
+def summarize(results: List[Dict]) -> List[Dict]:
+    """Per-configuration mean and spread of the learned concepts."""
+    groups: Dict[str, List[Dict]] = {}
+    for r in results:
+        groups.setdefault(json.dumps(r['config'], sort_keys=True), []).append(r)
+
+    rows = []
+    for key, runs in groups.items():
+        row = {'config': json.loads(key), 'seeds': len(runs)}
+        for name in runs[0]['weather_concepts']:
+            values = [r['weather_concepts'][name] for r in runs]
+            mean = sum(values) / len(values)
+            row[name] = mean
+            row[name + '_std'] = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+        row['mean_steps'] = sum(r['steps_run'] for r in runs) / len(runs)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sweeps over World climate settings.")
+    parser.add_argument('spec', help='sweep spec (JSON file)')
+    parser.add_argument('--cache', default='sweep_cache', help='directory for per-job results')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: CPUs)')
+    parser.add_argument('--tol', type=float, default=1e-3, help='per-storm-cycle concept change counted as converged')
+    parser.add_argument('--out', help='write the per-configuration summary here (JSON)')
+    args = parser.parse_args()
+
+    with open(args.spec) as fh:
+        spec = json.load(fh)
+
+    rows = summarize(run_sweep(spec, args.cache, args.workers, args.tol))
+
+    varied = sorted(set(spec.get('grid', {})) | set(spec.get('random', {})))
+    print(f"\n{'  '.join(f'{n:>18}' for n in varied)}  {'storm_is_bad':>13}  {'shelter_protects':>16}  {'steps':>7}")
+    for row in sorted(rows, key=lambda r: [r['config'][n] for n in varied]):
+        cols = '  '.join(f"{row['config'][n]:>18.6g}" for n in varied)
+        print(f"{cols}  {row['storm_is_bad']:>13.3f}  {row['shelter_protects']:>16.3f}  {row['mean_steps']:>7.0f}")
+
+    if args.out:
+        _write_json(args.out, {'spec': spec, 'summary': rows})
+
+
+if __name__ == '__main__':
+    main()
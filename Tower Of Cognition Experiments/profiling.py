@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Per-phase profiling for the shelter-seeking experiment.
+
+Enabled by setting VINE_PROFILE=1 in the environment (or passing
+profile=True to run_experiment). Phases are timed by shadowing the
+bound methods on the world/agent instances, so an unprofiled run pays
+nothing. Phase times are inclusive: 'sense' contains
+'World.nearby_food_into'.
+
+    profiler = PhaseProfiler()
+    profiler.instrument(world, agent)
+    ...
+    profiler.report()
+"""
+
+import os
+import time
+from typing import Dict, Tuple
+
+from psudocode_shelter_seeking import ACTION_NAMES, ShelterSeekingTardigrade, World
+
+
+PROFILE_ENV_VAR = 'VINE_PROFILE'
+
+
+def profiling_requested() -> bool:
+    return os.environ.get(PROFILE_ENV_VAR, '') not in ('', '0')
+
+
+class PhaseStats:
+    """
+    Call count, total/max time and a latency histogram for one phase.
+
+    Each power-of-two range of durations is split into SUB_BUCKETS
+    equal-width buckets (durations below 2 * SUB_BUCKETS ns get one
+    bucket each), so a bucket spans at most 1/SUB_BUCKETS of its lower
+    bound. Percentiles interpolate linearly within their bucket.
+    """
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'buckets')
+
+    SUB_BITS = 3
+    SUB_BUCKETS = 1 << SUB_BITS
+    N_BUCKETS = (64 - SUB_BITS) * SUB_BUCKETS
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * self.N_BUCKETS
+
+    @classmethod
+    def bucket_of(cls, ns: int) -> int:
+        e = ns.bit_length()
+        if e <= cls.SUB_BITS + 1:
+            return ns
+        return ((e - cls.SUB_BITS) << cls.SUB_BITS) + ((ns >> (e - cls.SUB_BITS - 1)) & (cls.SUB_BUCKETS - 1))
+
+    @classmethod
+    def bucket_range(cls, b: int) -> Tuple[int, int]:
+        """(lowest duration, width) in ns of bucket b."""
+        if b < 2 * cls.SUB_BUCKETS:
+            return b, 1
+        shift = (b >> cls.SUB_BITS) - 1
+        return (cls.SUB_BUCKETS + (b & (cls.SUB_BUCKETS - 1))) << shift, 1 << shift
+
+    def add(self, ns: int):
+        self.calls += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[self.bucket_of(ns)] += 1
+
+    def percentile(self, q: float) -> int:
+        """Estimated q-th percentile (ns), interpolated within its bucket."""
+        if not self.calls:
+            return 0
+        rank = q / 100.0 * self.calls
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low, width = self.bucket_range(b)
+                return min(int(low + width * (rank - seen) / n), self.max_ns)
+            seen += n
+        return self.max_ns
+
+
+class PhaseProfiler:
+    """Per-phase timers plus action-frequency counters for one simulation."""
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.action_counts = [0] * len(ACTION_NAMES)
+
+    def wrap(self, name: str, fn, count_actions: bool = False):
+        stats = self.phases.setdefault(name, PhaseStats())
+        actions = self.action_counts
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            t0 = clock()
+            result = fn(*args, **kwargs)
+            stats.add(clock() - t0)
+            if count_actions:
+                actions[result] += 1
+            return result
+
+        return timed
+
+    def instrument(self, world: World, agent: ShelterSeekingTardigrade):
+        """Time the simulation phases of this world/agent pair."""
+        world.update = self.wrap('World.update', world.update)
+        world.nearby_food_into = self.wrap('World.nearby_food_into', world.nearby_food_into)
+        agent.sense = self.wrap('sense', agent.sense)
+        agent.decide_action = self.wrap('decide_action', agent.decide_action, count_actions=True)
+        agent._execute = self.wrap('_execute', agent._execute)
+        agent._update_concept = self.wrap('_update_concept', agent._update_concept)
+
+    def report(self):
+        print("\nProfile (ns per call):")
+        print(f"  {'phase':<24}{'calls':>10}{'total ms':>11}{'mean':>9}"
+              f"{'p50':>9}{'p90':>9}{'p99':>9}{'max':>10}")
+        for name, st in self.phases.items():
+            if not st.calls:
+                continue
+            print(f"  {name:<24}{st.calls:>10}{st.total_ns / 1e6:>11.1f}"
+                  f"{st.total_ns // st.calls:>9}{st.percentile(50):>9}"
+                  f"{st.percentile(90):>9}{st.percentile(99):>9}{st.max_ns:>10}")
+        total = sum(self.action_counts)
+        if total:
+            print("\nAction frequencies:")
+            for code, n in enumerate(self.action_counts):
+                if n:
+                    print(f"  {ACTION_NAMES[code]:<16}{n:>10}  {100.0 * n / total:5.1f}%")
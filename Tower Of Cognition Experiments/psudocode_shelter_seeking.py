@@ -21,8 +21,13 @@ For collaboration inquiries:  Contact via repository issues
 
 import math
 import random
+import sys
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from convergence import ConvergenceMonitor
 
 
 # ============================================================
@@ -40,6 +45,33 @@ def _update_association(current: float, target: float, learning_rate: float = 0.
     return current + learning_rate * (target - current)
 
 
+# ============================================================
+# ACTIONS
+# ============================================================
+
+ACT_WANDER = 0
+ACT_SEEK_SHELTER = 1
+ACT_STAY_SHELTERED = 2
+ACT_REST = 3
+ACT_DEPOSIT = 4
+ACT_RETRIEVE = 5
+ACT_EAT_CARRIED = 6
+ACT_PICK = 7
+ACT_EAT = 8
+
+ACTION_NAMES: Tuple[str, ...] = (
+    'wander',
+    'seek_shelter',
+    'stay_sheltered',
+    'rest',
+    'deposit',
+    'retrieve',
+    'eat_carried',
+    'pick',
+    'eat',
+)
+
+
 # ============================================================
 # WORLD OBJECTS
 # ============================================================
@@ -55,32 +87,173 @@ class Food:
     picked: bool = False
     in_bin: bool = False
     respawn_timer: int = 0
+    slot: int = -1          # index in the food pool (World.food), -1 if none
+
+
+class FoodPool(list):
+    """
+    Append-only list of Food that keeps each item's `slot` equal to its
+    index. World.food is one of these, so food added by any route
+    (spawn_food, the `food=` field, a plain append) can be found again
+    by slot. Anything that would move or drop an item raises TypeError;
+    eaten food stays in the pool with its flag set.
+    """
+
+    def __init__(self, foods=()):
+        super().__init__()
+        self.extend(foods)
+
+    def append(self, food: Food):
+        food.slot = len(self)
+        super().append(food)
+
+    def extend(self, foods):
+        for food in foods:
+            self.append(food)
+
+    def __iadd__(self, foods):
+        self.extend(foods)
+        return self
+
+    def _append_only(self, *args, **kwargs):
+        raise TypeError("FoodPool is append-only: removing or reordering food would break shelter slots")
+
+    insert = remove = pop = clear = sort = reverse = _append_only
+    __setitem__ = __delitem__ = __imul__ = _append_only
 
 
 @dataclass
 class ShelterBin:
-    """Storage bin that also provides shelter from weather."""
+    """
+    Storage bin that also provides shelter from weather.
+
+    Stored food is a FIFO ring buffer of slot indices into `pool` (the
+    world's FoodPool), so deposit and retrieve are O(1) however large
+    the stockpile. Food not yet in the pool is appended on deposit. The
+    ring doubles when full.
+    """
     x: float
     y: float
-    contents: List[Food] = field(default_factory=list)
     size: float = 10.0
+    pool: Optional[FoodPool] = field(default=None, repr=False, compare=False)
+    deposited: int = field(default=0, init=False)
+    retrieved: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if not isinstance(self.size, (int, float)):
+            # Old signature was ShelterBin(x, y, contents, size)
+            raise TypeError(
+                "ShelterBin no longer takes a contents list; pass size by "
+                "keyword and add food with deposit() / deposit_many()"
+            )
+        if self.pool is None:
+            self.pool = FoodPool()
+        elif not isinstance(self.pool, FoodPool):
+            self.pool = FoodPool(self.pool)
+        self._ring = array('q', bytes(8 * 16))
+        self._mask = 15
+        self._head = 0
+        self._size = 0
+
+    def _slot_of(self, food: Food) -> int:
+        pool = self.pool
+        slot = food.slot
+        if 0 <= slot < len(pool) and pool[slot] is food:
+            return slot
+        pool.append(food)
+        return food.slot
+
+    def _reserve(self, n: int):
+        """Make room for n more items, doubling the ring as needed."""
+        capacity = self._mask + 1
+        if self._size + n <= capacity:
+            return
+        while capacity < self._size + n:
+            capacity *= 2
+        ring = array('q', bytes(8 * capacity))
+        ring[:self._size] = array('q', self.slots())
+        self._ring = ring
+        self._mask = capacity - 1
+        self._head = 0
 
     def deposit(self, food: Food) -> bool:
+        self._reserve(1)
         food.in_bin = True
         food.x = self.x
         food.y = self.y
-        self.contents.append(food)
+        self._ring[(self._head + self._size) & self._mask] = self._slot_of(food)
+        self._size += 1
+        self.deposited += 1
         return True
 
+    def deposit_many(self, foods: List[Food]) -> int:
+        """Deposit a batch (e.g. a whole population's tick). Returns count."""
+        self._reserve(len(foods))
+        ring = self._ring
+        mask = self._mask
+        tail = self._head + self._size
+        x, y = self.x, self.y
+        for food in foods:
+            food.in_bin = True
+            food.x = x
+            food.y = y
+            ring[tail & mask] = self._slot_of(food)
+            tail += 1
+        self._size += len(foods)
+        self.deposited += len(foods)
+        return len(foods)
+
     def retrieve(self) -> Optional[Food]:
-        if self.contents:
-            food = self.contents.pop(0)
+        if self._size:
+            food = self.pool[self._ring[self._head]]
+            self._head = (self._head + 1) & self._mask
+            self._size -= 1
+            self.retrieved += 1
             food.in_bin = False
             return food
         return None
 
+    def retrieve_many(self, n: int) -> List[Food]:
+        """Retrieve up to n items, oldest first."""
+        n = max(0, min(n, self._size))
+        ring = self._ring
+        mask = self._mask
+        pool = self.pool
+        head = self._head
+        out = []
+        for i in range(head, head + n):
+            food = pool[ring[i & mask]]
+            food.in_bin = False
+            out.append(food)
+        self._head = (head + n) & mask
+        self._size -= n
+        self.retrieved += n
+        return out
+
     def count(self) -> int:
-        return len(self.contents)
+        return self._size
+
+    def slots(self) -> List[int]:
+        """Pool slots of the stored food, oldest first."""
+        ring = self._ring
+        mask = self._mask
+        return [ring[i & mask] for i in range(self._head, self._head + self._size)]
+
+    @property
+    def contents(self) -> List[Food]:
+        """Stored food, oldest first (a fresh list; O(n))."""
+        pool = self.pool
+        return [pool[i] for i in self.slots()]
+
+    def restore(self, pool: FoodPool, slots: List[int]):
+        """Point the bin at `pool` and refill the ring with `slots` as-is,
+        without touching food flags or counters."""
+        self.pool = pool
+        self._size = 0
+        self._head = 0
+        self._reserve(len(slots))
+        self._ring[:len(slots)] = array('q', slots)
+        self._size = len(slots)
 
     def is_inside(self, x: float, y: float) -> bool:
         """Check if position is inside the shelter."""
@@ -88,14 +261,208 @@ class ShelterBin:
         return dist < self.size
 
 
+class ShelterIndex:
+    """
+    Uniform grid over shelter centres for nearest / inside-any queries.
+
+    The cell size is at least the largest shelter radius, so a shelter
+    containing a point always sits in the point's cell or one of its
+    eight neighbours. Nearest queries search outward ring by ring,
+    clipped to the occupied bounding box, and stop once no unvisited
+    ring can hold anything closer. Up to LINEAR_MAX shelters a plain
+    scan is cheaper, so that is used instead.
+    """
+
+    # Crossover measured with bench_shelter_seeking.py (uncached sense,
+    # 100x100 and 1000x1000 worlds): the scan wins up to ~64 shelters
+    LINEAR_MAX = 64
+
+    def __init__(self, shelters: Sequence[ShelterBin] = (), cell_size: float = 20.0):
+        self._clear(cell_size)
+        for shelter in shelters:
+            self.insert(shelter)
+
+    def _clear(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[ShelterBin]] = {}
+        self.shelters: List[ShelterBin] = []
+        self.count = 0
+        self.max_size = 0.0
+        self.uniform_size = True
+        self._ci_min = self._ci_max = self._cj_min = self._cj_max = 0
+
+    def _rebuild(self, cell_size: float):
+        """Re-bin every indexed shelter into cells of `cell_size`."""
+        shelters = self.shelters
+        self._clear(cell_size)
+        for shelter in shelters:
+            self.insert(shelter)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, shelter: ShelterBin):
+        if shelter.size > self.cell_size:
+            # Cells must be wide enough for the new shelter
+            self._rebuild(shelter.size)
+        if self.count and shelter.size != self.max_size:
+            self.uniform_size = False
+        self.max_size = max(self.max_size, shelter.size)
+
+        ci, cj = self._cell(shelter.x, shelter.y)
+        if not self.count:
+            self._ci_min = self._ci_max = ci
+            self._cj_min = self._cj_max = cj
+        else:
+            self._ci_min = min(self._ci_min, ci)
+            self._ci_max = max(self._ci_max, ci)
+            self._cj_min = min(self._cj_min, cj)
+            self._cj_max = max(self._cj_max, cj)
+        self.cells.setdefault((ci, cj), []).append(shelter)
+        self.shelters.append(shelter)
+        self.count += 1
+
+    def nearest(self, x: float, y: float) -> Tuple[Optional[ShelterBin], float]:
+        """Closest shelter centre to (x, y) and its distance."""
+        best: Optional[ShelterBin] = None
+        best_d2 = math.inf
+        if self.count <= self.LINEAR_MAX:
+            for shelter in self.shelters:
+                dx = shelter.x - x
+                dy = shelter.y - y
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best, best_d2 = shelter, d2
+            return best, math.sqrt(best_d2)
+
+        cells = self.cells
+        ci, cj = self._cell(x, y)
+        i_min, i_max, j_min, j_max = self._ci_min, self._ci_max, self._cj_min, self._cj_max
+        # Rings beyond this cover no occupied cell
+        max_ring = max(abs(ci - i_min), abs(ci - i_max), abs(cj - j_min), abs(cj - j_max))
+        for k in range(max_ring + 1):
+            j_lo = max(cj - k, j_min)
+            j_hi = min(cj + k, j_max)
+            for i in range(max(ci - k, i_min), min(ci + k, i_max) + 1):
+                if i == ci - k or i == ci + k:
+                    js = range(j_lo, j_hi + 1)
+                elif k:
+                    js = [j for j in (cj - k, cj + k) if j_lo <= j <= j_hi]
+                else:
+                    js = (cj,)
+                for j in js:
+                    cell = cells.get((i, j))
+                    if cell is None:
+                        continue
+                    for shelter in cell:
+                        dx = shelter.x - x
+                        dy = shelter.y - y
+                        d2 = dx * dx + dy * dy
+                        if d2 < best_d2:
+                            best, best_d2 = shelter, d2
+            # Everything in ring k+1 is at least k cells away
+            reach = k * self.cell_size
+            if best_d2 <= reach * reach:
+                break
+        return best, math.sqrt(best_d2)
+
+    def containing(self, x: float, y: float) -> Optional[ShelterBin]:
+        """Some shelter that (x, y) is inside, if any."""
+        ci, cj = self._cell(x, y)
+        for i in (ci - 1, ci, ci + 1):
+            for j in (cj - 1, cj, cj + 1):
+                for shelter in self.cells.get((i, j), ()):
+                    if shelter.is_inside(x, y):
+                        return shelter
+        return None
+
+
+# ============================================================
+# STEP RECORDS (allocated once, refilled every step)
+# ============================================================
+
+class WorldEvents:
+    """What changed during one World.update. Reused across steps."""
+    __slots__ = ('storm_started', 'storm_ended', 'storm', 'scarcity')
+
+    def __init__(self):
+        self.storm_started = False
+        self.storm_ended = False
+        self.storm = False
+        self.scarcity = False
+
+
+class ShelterQuery:
+    """
+    Nearest shelter and inside-any result for one position. World caches
+    one of these per tick, so exposure and sensing share a lookup.
+    `container` is the shelter the position is inside (None if none);
+    with mixed shelter sizes it need not be the nearest one.
+    """
+    __slots__ = ('x', 'y', 'tick', 'nearest', 'dist', 'inside', 'container')
+
+    def __init__(self):
+        self.x = math.nan
+        self.y = math.nan
+        self.tick = -1
+        self.nearest: Optional[ShelterBin] = None
+        self.dist = math.inf
+        self.inside = False
+        self.container: Optional[ShelterBin] = None
+
+
+class ShelterSense:
+    """What the agent perceives of the shelter. Reused across steps."""
+    __slots__ = ('x', 'y', 'dist', 'inside', 'contents')
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.dist = 0.0
+        self.inside = False
+        self.contents = 0
+
+
+class Sensing:
+    """
+    Full sensory input. Reused across steps.
+
+    Nearby food lives in two parallel slot lists; only the first
+    `food_count` entries are valid. Slots grow on demand and are never
+    shrunk, so a steady-state step allocates no containers.
+    """
+    __slots__ = (
+        'food', 'food_dist', 'food_count', 'shelter', 'is_scarcity',
+        'carrying', 'storm_active', 'storm_intensity', 'is_sheltered',
+        'exposure',
+    )
+
+    def __init__(self, capacity: int = 16):
+        self.food: List[Optional[Food]] = [None] * capacity
+        self.food_dist: List[float] = [0.0] * capacity
+        self.food_count = 0
+        self.shelter: Optional[ShelterSense] = None
+        self.is_scarcity = False
+        self.carrying = 0
+        self.storm_active = False
+        self.storm_intensity = 0.0
+        self.is_sheltered = False
+        self.exposure = 0.0
+
+
 @dataclass
 class World:
     """World with weather cycles and shelter."""
     width: float = 100.0
     height: float = 100.0
-    food: List[Food] = field(default_factory=list)
+    food: FoodPool = field(default_factory=FoodPool)
     bin: Optional[ShelterBin] = None
     next_id: int = 0
+    tick: int = 0
+
+    # Shelters: `bin` is shelters[0]; extra ones are placed at random
+    n_shelters: int = 1
+    shelters: List[ShelterBin] = field(default_factory=list, init=False, repr=False)
 
     # Scarcity cycle
     scarcity_active: bool = False
@@ -112,14 +479,46 @@ class World:
     storm_duration: int = 200
     storm_intensity: float = 0.0
 
+    events: WorldEvents = field(default_factory=WorldEvents, init=False, repr=False, compare=False)
+    shelter_index: ShelterIndex = field(default_factory=ShelterIndex, init=False, repr=False, compare=False)
+    _shelter_query: ShelterQuery = field(default_factory=ShelterQuery, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         self.bin = ShelterBin(
             x=random.uniform(15, 30),
             y=random.uniform(15, 30),
+            pool=self.food,
         )
         self.abundance_timer = self.abundance_duration
         self.calm_timer = self.calm_duration
 
+        self.reset_shelter_index(self.n_shelters)
+        self.add_shelter(self.bin)
+        for _ in range(self.n_shelters - 1):
+            self.add_shelter(ShelterBin(
+                x=random.uniform(10, self.width - 10),
+                y=random.uniform(10, self.height - 10),
+                pool=self.food,
+            ))
+
+    def reset_shelter_index(self, expected_shelters: int):
+        """Drop all shelters and size the index for `expected_shelters`."""
+        # About one shelter per grid cell keeps nearest queries short
+        cell = math.sqrt(self.width * self.height / max(1, expected_shelters))
+        self.shelters = []
+        self.shelter_index = ShelterIndex(cell_size=max(cell, self.bin.size if self.bin else 10.0))
+        self._shelter_query.tick = -1
+
+    def add_shelter(self, shelter: ShelterBin):
+        if shelter.pool is not self.food:
+            # Move stored food into this world's pool
+            foods = shelter.contents
+            shelter.pool = self.food
+            shelter.restore(self.food, [shelter._slot_of(f) for f in foods])
+        self.shelters.append(shelter)
+        self.shelter_index.insert(shelter)
+        self._shelter_query.tick = -1
+
     def spawn_food(self) -> Optional[Food]:
         if self.scarcity_active:
             return None
@@ -133,14 +532,16 @@ class World:
         self.food.append(f)
         return f
 
-    def update(self) -> Dict[str, any]:
-        """Update world state."""
-        events = {
-            'storm_started': False,
-            'storm_ended': False,
-            'weather': 'calm',
-            'scarcity': 'abundance',
-        }
+    def live_food_count(self) -> int:
+        """Food not yet eaten or stored; simulation_step respawns against this."""
+        return sum(1 for f in self.food if not f.eaten and not f.in_bin)
+
+    def update(self) -> WorldEvents:
+        """Update world state. The returned record is reused next step."""
+        self.tick += 1
+        events = self.events
+        events.storm_started = False
+        events.storm_ended = False
 
         # Weather cycle
         if self.storm_active:
@@ -151,9 +552,9 @@ class World:
                 self.storm_active = False
                 self.storm_intensity = 0.0
                 self.calm_timer = self.calm_duration + random.randint(-50, 50)
-                events['storm_ended'] = True
+                events.storm_ended = True
 
-            events['weather'] = 'storm'
+            events.storm = True
         else:
             self.calm_timer -= 1
             self.storm_intensity = 0.0
@@ -162,9 +563,9 @@ class World:
                 self.storm_active = True
                 self.storm_timer = self.storm_duration + random.randint(-30, 30)
                 self.storm_intensity = 0.3
-                events['storm_started'] = True
+                events.storm_started = True
 
-            events['weather'] = 'calm'
+            events.storm = False
 
         # Scarcity cycle
         if self.scarcity_active:
@@ -172,13 +573,13 @@ class World:
             if self.scarcity_timer <= 0:
                 self.scarcity_active = False
                 self.abundance_timer = self.abundance_duration
-            events['scarcity'] = 'scarcity'
+            events.scarcity = True
         else:
             self.abundance_timer -= 1
             if self.abundance_timer <= 0:
                 self.scarcity_active = True
                 self.scarcity_timer = self.scarcity_duration
-            events['scarcity'] = 'abundance'
+            events.scarcity = False
 
         return events
 
@@ -192,11 +593,57 @@ class World:
                 nearby.append(f)
         return nearby
 
+    def nearby_food_into(self, x: float, y: float, radius: float, sensing: Sensing) -> int:
+        """Like get_nearby_food, but fills the sensing food slots in place."""
+        objs = sensing.food
+        dists = sensing.food_dist
+        r2 = radius * radius
+        n = 0
+        for f in self.food:
+            if f.eaten or f.picked or f.in_bin:
+                continue
+            dx = f.x - x
+            dy = f.y - y
+            d2 = dx * dx + dy * dy
+            if d2 < r2:
+                if n == len(objs):
+                    objs.append(f)
+                    dists.append(0.0)
+                objs[n] = f
+                dists[n] = math.sqrt(d2)
+                n += 1
+        sensing.food_count = n
+        return n
+
+    def shelter_query(self, x: float, y: float) -> ShelterQuery:
+        """
+        Nearest shelter and whether (x, y) is inside any shelter.
+
+        The result is cached until the next tick or a query elsewhere;
+        the returned record is reused, so copy out what you keep.
+        """
+        q = self._shelter_query
+        if q.tick == self.tick and q.x == x and q.y == y:
+            return q
+        index = self.shelter_index
+        q.x = x
+        q.y = y
+        q.tick = self.tick
+        q.nearest, q.dist = index.nearest(x, y)
+        if q.nearest is not None and q.dist < q.nearest.size:
+            q.container = q.nearest
+        elif index.uniform_size:
+            q.container = None
+        else:
+            q.container = index.containing(x, y)
+        q.inside = q.container is not None
+        return q
+
     def is_sheltered(self, x: float, y: float) -> bool:
         """Check if position is sheltered from weather."""
-        if not self.bin:
+        if not self.shelters:
             return False
-        return self.bin.is_inside(x, y)
+        return self.shelter_query(x, y).inside
 
     def get_exposure(self, x: float, y: float) -> float:
         """Get weather exposure. 0 = sheltered, 1 = fully exposed."""
@@ -205,6 +652,23 @@ class World:
         return self.storm_intensity
 
 
+def _get_food(world: World) -> FoodPool:
+    return world._food
+
+
+def _set_food(world: World, foods):
+    if '_food' in world.__dict__:
+        raise AttributeError(
+            "World.food is the shelters' slot pool and cannot be replaced; "
+            "append to it instead"
+        )
+    world._food = foods if isinstance(foods, FoodPool) else FoodPool(foods)
+
+
+# Set once by __init__ (wrapping a plain list in a FoodPool), read-only after
+World.food = property(_get_food, _set_food)
+
+
 # ============================================================
 # AGENT (LEARNING CORE REDACTED)
 # ============================================================
@@ -227,9 +691,12 @@ class ShelterSeekingTardigrade:
         self.carried: List[Food] = []
         self.max_carry = 3
 
-        # Spatial memory
+        # Spatial memory: most recent shelter, plus a bounded set of
+        # remembered shelters (oldest sighting evicted first)
         self.shelter_location_memory: Optional[Tuple[float, float]] = None
         self.shelter_confidence: float = 0.0
+        self.shelter_memories: Dict[Tuple[float, float], float] = {}
+        self.max_shelter_memories = 8
 
         # Rest state
         self.is_resting: bool = False
@@ -260,6 +727,7 @@ class ShelterSeekingTardigrade:
         self.was_in_storm: bool = False
         self.energy_before_storm: float = 0.5
         self.storm_exposure_total: float = 0.0
+        self.exposure: float = 0.0
 
         # Stats
         self.food_eaten = 0
@@ -269,65 +737,79 @@ class ShelterSeekingTardigrade:
         self.rest_sessions = 0
         self.storms_survived = 0
 
+        # Optional ConvergenceMonitor fed by concept/action-value updates
+        self.concept_monitor: Optional[ConvergenceMonitor] = None
+
+        # Per-step records, refilled in place by sense()
+        self.sensing = Sensing()
+        self._shelter_sense = ShelterSense()
+
     @property
     def carrying_count(self) -> int:
         return len(self.carried)
 
-    def sense_shelter(self, world: World) -> Optional[Dict]:
-        """Sense the shelter/bin."""
-        if not world.bin:
+    def remember_shelter(self, x: float, y: float):
+        """Record a shelter sighting in the bounded spatial memory."""
+        memories = self.shelter_memories
+        location = self.shelter_location_memory
+        if location is None or location[0] != x or location[1] != y:
+            location = (x, y)
+            self.shelter_location_memory = location
+        confidence = memories.pop(location, 0.0)
+        memories[location] = min(1.0, confidence + 0.15)
+        if len(memories) > self.max_shelter_memories:
+            del memories[next(iter(memories))]
+
+    def sense_shelter(self, world: World) -> Optional[ShelterSense]:
+        """
+        Sense the shelter we are in, else the nearest one.
+        The returned record is reused next step.
+        """
+        if not world.shelters:
             return None
 
-        dist = math.sqrt((world.bin.x - self.x)**2 + (world.bin.y - self.y)**2)
+        query = world.shelter_query(self.x, self.y)
+        # Inside a shelter, that one is sensed even if another's centre is closer
+        sensed = query.nearest
+        dist = query.dist
+        if query.container is not None and query.container is not sensed:
+            sensed = query.container
+            dist = math.sqrt((sensed.x - self.x)**2 + (sensed.y - self.y)**2)
 
         if dist < 50.0:
             # Update memory
-            self.shelter_location_memory = (world.bin.x, world.bin.y)
+            self.remember_shelter(sensed.x, sensed.y)
             
             # REDACTED: Real system uses advanced memory consolidation
             # (not simple confidence updates)
             self.shelter_confidence = min(1.0, self.shelter_confidence + 0.15)
 
-            self.in_shelter = world.bin.is_inside(self.x, self.y)
+            self.in_shelter = query.inside
 
-            return {
-                'x': world.bin.x,
-                'y': world.bin.y,
-                'dist': dist,
-                'inside': self.in_shelter,
-                'contents': world.bin.count(),
-            }
+            shelter = self._shelter_sense
+            shelter.x = sensed.x
+            shelter.y = sensed.y
+            shelter.dist = dist
+            shelter.inside = self.in_shelter
+            shelter.contents = sensed.count()
+            return shelter
 
         return None
 
-    def sense(self, world: World) -> Dict:
-        """Full sensory input."""
-        nearby_food = world.get_nearby_food(self.x, self.y, radius=30.0)
-        shelter_info = self.sense_shelter(world)
-
-        sensing = {
-            'nearby_food': [],
-            'shelter': shelter_info,
-            'is_scarcity': world.scarcity_active,
-            'carrying': self.carrying_count,
-            'storm_active': world.storm_active,
-            'storm_intensity': world.storm_intensity,
-            'is_sheltered': self.in_shelter,
-            'exposure': world.get_exposure(self.x, self.y),
-        }
-
-        for f in nearby_food:
-            dist = math.sqrt((f.x - self.x)**2 + (f.y - self.y)**2)
-            sensing['nearby_food'].append({
-                'id': f.id,
-                'dist': dist,
-                'nutrition': f.nutrition,
-                'obj': f,
-            })
-
+    def sense(self, world: World) -> Sensing:
+        """Full sensory input. The returned record is reused next step."""
+        sensing = self.sensing
+        world.nearby_food_into(self.x, self.y, 30.0, sensing)
+        sensing.shelter = self.sense_shelter(world)
+        sensing.is_scarcity = world.scarcity_active
+        sensing.carrying = self.carrying_count
+        sensing.storm_active = world.storm_active
+        sensing.storm_intensity = world.storm_intensity
+        sensing.is_sheltered = self.in_shelter
+        sensing.exposure = world.get_exposure(self.x, self.y)
         return sensing
 
-    def decide_action(self, sensing: Dict) -> str:
+    def decide_action(self, sensing: Sensing) -> int:
         """
         Decide what to do.
         
@@ -336,54 +818,54 @@ class ShelterSeekingTardigrade:
         """
 
         # Storm response (simplified)
-        if sensing['storm_active']:
+        if sensing.storm_active:
             # REDACTED: Real system calculates internal state priorities
             # based on learned associations (method proprietary)
             
             # Placeholder: simple threshold logic
             storm_fear = self.weather_concepts['storm_is_bad']
             shelter_value = self.weather_concepts['shelter_protects']
-            urgency = storm_fear + shelter_value + sensing['storm_intensity']
+            urgency = storm_fear + shelter_value + sensing.storm_intensity
 
             if urgency > 0.3 or random.random() < 0.3:
-                if sensing['is_sheltered']:
+                if sensing.is_sheltered:
                     if self.fatigue > 0.3 or self.energy < 0.5:
-                        return 'rest'
-                    return 'stay_sheltered'
+                        return ACT_REST
+                    return ACT_STAY_SHELTERED
                 else:
-                    return 'seek_shelter'
+                    return ACT_SEEK_SHELTER
 
         # Continue resting if needed
         if self.is_resting:
             if self.fatigue < 0.1 and self.energy > 0.7:
                 self.is_resting = False
             else:
-                return 'rest'
+                return ACT_REST
 
         # Rest if tired and safe
-        if self.fatigue > 0.6 and sensing['is_sheltered']:
-            return 'rest'
+        if self.fatigue > 0.6 and sensing.is_sheltered:
+            return ACT_REST
 
         # Storage behavior
-        if sensing['shelter'] and sensing['shelter']['inside']:
-            if self.carrying_count > 0 and not sensing['is_scarcity']:
-                return 'deposit'
-            if sensing['is_scarcity'] and sensing['shelter']['contents'] > 0:
-                return 'retrieve'
+        if sensing.shelter is not None and sensing.shelter.inside:
+            if self.carrying_count > 0 and not sensing.is_scarcity:
+                return ACT_DEPOSIT
+            if sensing.is_scarcity and sensing.shelter.contents > 0:
+                return ACT_RETRIEVE
 
         # Hunger
         if self.energy < 0.35 and self.carrying_count > 0:
-            return 'eat_carried'
+            return ACT_EAT_CARRIED
 
         # Food acquisition
-        if sensing['nearby_food']:
-            if self.carrying_count < self.max_carry and not sensing['is_scarcity']:
+        if sensing.food_count:
+            if self.carrying_count < self.max_carry and not sensing.is_scarcity:
                 if random.random() < 0.35:
-                    return 'pick'
+                    return ACT_PICK
             if self.energy < 0.6:
-                return 'eat'
+                return ACT_EAT
 
-        return 'wander'
+        return ACT_WANDER
 
     def _update_concept(self, concept_name: str, target_value: float, strength: float = 0.2):
         """
@@ -395,9 +877,10 @@ class ShelterSeekingTardigrade:
         This demo: Direct value updates (not the actual mechanism).
         """
         current = self.weather_concepts[concept_name]
-        self.weather_concepts[concept_name] = _update_association(
-            current, target_value, learning_rate=strength
-        )
+        updated = _update_association(current, target_value, learning_rate=strength)
+        self.weather_concepts[concept_name] = updated
+        if self.concept_monitor is not None:
+            self.concept_monitor.record(concept_name, updated - current)
 
     def observe_storm_start(self, world: World):
         """Called when storm begins."""
@@ -430,17 +913,21 @@ class ShelterSeekingTardigrade:
             self._update_concept('shelter_protects', 0.9, strength=0.2)
             # Update action value
             current = self.action_values['seek_shelter']
-            self.action_values['seek_shelter'] = _update_association(current, 0.8, 0.15)
+            updated = _update_association(current, 0.8, 0.15)
+            self.action_values['seek_shelter'] = updated
+            if self.concept_monitor is not None:
+                self.concept_monitor.record('action:seek_shelter', updated - current)
 
         self.storms_survived += 1
         self.was_in_storm = False
 
-    def step(self, world: World) -> str:
-        """One simulation step."""
+    def step(self, world: World) -> int:
+        """One simulation step. Returns the action code taken."""
         
         # Energy decay (faster in storms when exposed)
         base_decay = 0.001
         exposure = world.get_exposure(self.x, self.y)
+        self.exposure = exposure
         weather_decay = exposure * 0.004
         scarcity_decay = 0.001 if world.scarcity_active else 0
         
@@ -474,10 +961,10 @@ class ShelterSeekingTardigrade:
         
         return result
 
-    def _execute(self, action: str, world: World, sensing: Dict) -> str:
+    def _execute(self, action: int, world: World, sensing: Sensing) -> int:
         """Execute action (implementation details omitted for brevity)."""
         # Full implementation in actual code
-        # Returns action result string
+        # Returns action code (see ACTION_NAMES)
         return action
 
 
@@ -485,46 +972,93 @@ class ShelterSeekingTardigrade:
 # TRAINING
 # ============================================================
 
-def run_experiment():
-    """Run the shelter-seeking experiment."""
-    
-    world = World(width=80, height=80)
-    
-    # Spawn initial food
-    for _ in range(10):
-        world.spawn_food()
+def simulation_step(world: World, agent: ShelterSeekingTardigrade, step: int,
+                    food_target: int = 8) -> int:
+    """
+    Advance world and agent by one step. Returns the agent's action code.
 
-    # Create agent (starts far from shelter)
-    agent = ShelterSeekingTardigrade(x=60, y=60)
+    Food is topped up every 30 steps while fewer than `food_target`
+    items are on the ground.
+    """
+    events = world.update()
 
-    print("Training for 10000 steps...")
-    
-    for step in range(10000):
-        events = world.update()
+    if events.storm_started:
+        agent.observe_storm_start(world)
+
+    if events.storm_ended:
+        agent.observe_storm_end()
+
+    action = agent.step(world)
+
+    if events.storm_ended and agent.concept_monitor is not None:
+        agent.concept_monitor.end_cycle(step)
+
+    # Respawn food during abundance
+    if not world.scarcity_active and step % 30 == 0:
+        if world.live_food_count() < food_target:
+            world.spawn_food()
 
-        if events['storm_started']:
-            agent.observe_storm_start(world)
+    return action
 
-        if events['storm_ended']:
-            agent.observe_storm_end()
 
-        agent.step(world)
+# ============================================================
+# SELF-CHECK
+# ============================================================
 
-        # Respawn food during abundance
-        if not world.scarcity_active and step % 30 == 0:
-            if len([f for f in world.food if not f.eaten and not f.in_bin]) < 8:
-                world.spawn_food()
+def check_shelter_bin(ops: int = 50_000, seed: int = 0):
+    """
+    Drive a ShelterBin with a random mix of single and bulk operations
+    and compare it against a deque after every one.
 
-    # Report results
-    print(f"\nResults:")
-    print(f"  Storms survived: {agent.storms_survived}")
-    print(f"  Times sheltered: {agent.times_sheltered}")
-    print(f"  Times exposed: {agent.times_exposed}")
-    print(f"  Final energy: {agent.energy:.2f}")
-    print(f"\nLearned concepts:")
-    print(f"  storm_is_bad: {agent.weather_concepts['storm_is_bad']:.2f}")
-    print(f"  shelter_protects: {agent.weather_concepts['shelter_protects']:.2f}")
+        python psudocode_shelter_seeking.py --check
+    """
+    rng = random.Random(seed)
+    world = World(width=80, height=80, food=[Food(x=0.0, y=0.0, id=i) for i in range(4)])
+    shelter = world.bin
+    reference = deque()
+    next_id = 4
+    for _ in range(ops):
+        op = rng.randrange(4)
+        if op == 0:
+            if reference and rng.random() < 0.5:
+                # Re-deposit something already in the pool
+                food = rng.choice(world.food)
+                if food.in_bin:
+                    continue
+            else:
+                food = Food(x=0.0, y=0.0, id=next_id)
+                next_id += 1
+                if rng.random() < 0.5:
+                    world.food.append(food)
+            shelter.deposit(food)
+            reference.append(food)
+        elif op == 1:
+            foods = [Food(x=0.0, y=0.0, id=next_id + i) for i in range(rng.randrange(8))]
+            next_id += len(foods)
+            shelter.deposit_many(foods)
+            reference.extend(foods)
+        elif op == 2:
+            got = shelter.retrieve()
+            want = reference.popleft() if reference else None
+            assert got is want, "retrieve returned the wrong item"
+        else:
+            n = rng.randrange(-2, 2 * len(reference) + 3)
+            got = shelter.retrieve_many(n)
+            want = [reference.popleft() for _ in range(max(0, min(n, len(reference))))]
+            assert got == want and all(a is b for a, b in zip(got, want)), "retrieve_many mismatch"
+        assert shelter.count() == len(reference)
+        assert shelter.deposited - shelter.retrieved == len(reference)
+    assert all(a is b for a, b in zip(shelter.contents, reference))
+    assert len({id(f) for f in world.food}) == len(world.food), "duplicate food in the pool"
+    assert all(f.slot == i for i, f in enumerate(world.food))
+    print(f"ShelterBin matches a deque over {ops} operations "
+          f"({shelter.deposited} deposited, {len(world.food)} pooled)")
 
 
 if __name__ == '__main__':
-    run_experiment()
+    if '--check' in sys.argv[1:]:
+        check_shelter_bin()
+    else:
+        # The run harness lives in experiment.py, which imports this module
+        from experiment import run_experiment
+        run_experiment()
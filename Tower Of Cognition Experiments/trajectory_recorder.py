@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Bounded trajectory recording for the shelter-seeking experiment.
+
+A TrajectoryRecorder samples the agent once per step (optionally every
+Nth step) into preallocated typed arrays. Memory is bounded by
+`capacity` samples in one of two modes:
+
+- 'ring':    keep the most recent `capacity` samples, overwrite older ones
+- 'chunked': when the buffer fills, spill it to `<prefix>.NNNNN.npz`
+             and start the next chunk, so the whole run is kept on disk
+
+Recordings export to compressed .npz and are read back with
+TrajectoryReplay, which rebuilds timelines without re-simulating:
+
+    recorder = TrajectoryRecorder(capacity=200_000, every=10)
+    run_experiment(steps=10_000_000, recorder=recorder)
+    recorder.export('run.npz')
+
+    replay = TrajectoryReplay('run.npz')
+    replay.storm_intervals()
+"""
+
+import glob
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from psudocode_shelter_seeking import ACTION_NAMES
+
+
+# Column name -> array typecode (recording) / numpy dtype (export)
+COLUMNS: Tuple[Tuple[str, str, type], ...] = (
+    ('step', 'q', np.int64),
+    ('x', 'f', np.float32),
+    ('y', 'f', np.float32),
+    ('energy', 'f', np.float32),
+    ('fatigue', 'f', np.float32),
+    ('action', 'b', np.int8),
+    ('exposure', 'f', np.float32),
+    ('storm', 'B', np.bool_),
+)
+
+
+class TrajectoryRecorder:
+    """Per-step agent samples in fixed-size typed arrays."""
+
+    def __init__(self, capacity: int = 1_000_000, every: int = 1,
+                 mode: str = 'ring', chunk_prefix: Optional[str] = None):
+        if mode not in ('ring', 'chunked'):
+            raise ValueError(f"Unknown recorder mode: {mode!r}")
+        if mode == 'chunked' and not chunk_prefix:
+            raise ValueError("chunked mode needs a chunk_prefix")
+        if capacity <= 0 or every <= 0:
+            raise ValueError("capacity and every must be positive")
+
+        self.capacity = capacity
+        self.every = every
+        self.mode = mode
+        self.chunk_prefix = chunk_prefix
+
+        self.columns: Dict[str, array] = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, code, _ in COLUMNS
+        }
+        self.pos = 0              # next write slot
+        self.size = 0             # valid samples in the buffer
+        self.recorded = 0         # samples taken over the whole run
+        self.chunks_written: List[str] = []
+
+    def record(self, step: int, agent, world, action: int):
+        """Sample the agent after it has stepped. Call once per step."""
+        if step % self.every:
+            return
+
+        i = self.pos
+        c = self.columns
+        c['step'][i] = step
+        c['x'][i] = agent.x
+        c['y'][i] = agent.y
+        c['energy'][i] = agent.energy
+        c['fatigue'][i] = agent.fatigue
+        c['action'][i] = action
+        c['exposure'][i] = agent.exposure
+        c['storm'][i] = world.storm_active
+
+        self.recorded += 1
+        if self.size < self.capacity:
+            self.size += 1
+        i += 1
+        if i == self.capacity:
+            self.pos = 0
+            if self.mode == 'chunked':
+                self._spill()
+        else:
+            self.pos = i
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Buffered samples in chronological order, as numpy arrays (copies)."""
+        out = {}
+        wrapped = self.size == self.capacity and self.pos != 0
+        for name, _, dtype in COLUMNS:
+            col = np.frombuffer(self.columns[name], dtype=dtype)
+            if wrapped:
+                out[name] = np.concatenate((col[self.pos:], col[:self.pos]))
+            else:
+                out[name] = col[:self.size].copy()
+        return out
+
+    def _write(self, path: str):
+        np.savez_compressed(
+            path,
+            every=np.int64(self.every),
+            action_names=np.array(ACTION_NAMES),
+            **self.arrays(),
+        )
+
+    def _spill(self):
+        path = f"{self.chunk_prefix}.{len(self.chunks_written):05d}.npz"
+        self._write(path)
+        self.chunks_written.append(path)
+        self.size = 0
+
+    def export(self, path: Optional[str] = None) -> List[str]:
+        """
+        Write what is buffered and return the files that make up the run.
+
+        Ring mode writes the buffer to `path`. Chunked mode spills the
+        final partial chunk and ignores `path`.
+        """
+        if self.mode == 'chunked':
+            if self.size:
+                self._spill()
+                self.pos = 0
+            return list(self.chunks_written)
+        if path is None:
+            raise ValueError("ring mode export needs a path")
+        self._write(path)
+        return [path]
+
+
+class TrajectoryReplay:
+    """Read recorded trajectories back as numpy columns."""
+
+    def __init__(self, paths: Union[str, Sequence[str]]):
+        if isinstance(paths, str):
+            paths = sorted(glob.glob(paths)) or [paths]
+        if not paths:
+            raise ValueError("No trajectory files given")
+
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name, _, _ in COLUMNS}
+        for path in paths:
+            with np.load(path) as data:
+                self.every = int(data['every'])
+                self.action_names = tuple(str(a) for a in data['action_names'])
+                for name in parts:
+                    parts[name].append(data[name])
+
+        for name, chunks in parts.items():
+            setattr(self, name, np.concatenate(chunks))
+
+    def __len__(self) -> int:
+        return len(self.step)
+
+    def at(self, step: int) -> int:
+        """Index of the last sample taken at or before `step`."""
+        return max(0, int(np.searchsorted(self.step, step, side='right')) - 1)
+
+    def storm_intervals(self) -> List[Tuple[int, int]]:
+        """(first_step, last_step) of each storm seen in the samples."""
+        storm = self.storm.astype(np.int8)
+        edges = np.diff(np.concatenate(([0], storm, [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        return [(int(self.step[s]), int(self.step[e])) for s, e in zip(starts, ends)]
+
+    def sheltered_fraction(self) -> float:
+        """Fraction of storm samples spent with zero exposure."""
+        in_storm = self.storm
+        if not in_storm.any():
+            return 0.0
+        return float(np.mean(self.exposure[in_storm] == 0.0))
+
+    def action_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.action, minlength=len(self.action_names))
+        return {name: int(n) for name, n in zip(self.action_names, counts)}